@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Benchmark: outlet profile extraction vs. full newspaper parsing
+Runs over saved HTML fixtures. Fidelity is token F1 against a hand-checked
+<fixture>.txt when present, otherwise against newspaper's text.
+
+Usage: python3 bench_extract.py FIXTURE_DIR
+       python3 bench_extract.py --save FIXTURE_DIR URL...   (download pages as fixtures)
+
+FIXTURE_DIR/fixtures.jsonl lists one {"url": ..., "file": ...} per line.
+benchmarks/fixtures holds one trimmed page per outlet profile (also used by test_extractors.py).
+"""
+import os
+import sys
+import json
+import time
+import hashlib
+from collections import Counter, defaultdict
+from urllib.parse import urlparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from newspaper import Article
+import extractors
+
+MANIFEST = 'fixtures.jsonl'
+REPEATS = 3  # best-of timing per page
+USER_AGENT = "K8s-News-Engine/1.0 (+https://github.com/k8s-news-engine)"
+
+def save_fixtures(fixture_dir, urls):
+    import urllib.request
+
+    os.makedirs(fixture_dir, exist_ok=True)
+    with open(os.path.join(fixture_dir, MANIFEST), 'a') as manifest:
+        for url in urls:
+            request = urllib.request.Request(url, headers={'User-Agent': USER_AGENT})
+            with urllib.request.urlopen(request, timeout=20) as response:
+                body = response.read()
+            name = f"{urlparse(url).hostname}-{hashlib.sha1(url.encode('utf-8')).hexdigest()[:10]}.html"
+            with open(os.path.join(fixture_dir, name), 'wb') as f:
+                f.write(body)
+            manifest.write(json.dumps({'url': url, 'file': name}) + '\n')
+            print(f"saved {url} -> {name}")
+
+def load_fixtures(fixture_dir):
+    with open(os.path.join(fixture_dir, MANIFEST)) as manifest:
+        for line in manifest:
+            if not line.strip():
+                continue
+            fixture = json.loads(line)
+            path = os.path.join(fixture_dir, fixture['file'])
+            with open(path, 'rb') as f:
+                html = f.read().decode('utf-8', errors='replace')
+            gold = None
+            if os.path.exists(path + '.txt'):
+                with open(path + '.txt', encoding='utf-8') as f:
+                    gold = f.read()
+            yield fixture['url'], html, gold
+
+def newspaper_text(url, html):
+    article = Article(url)
+    article.download(input_html=html)
+    article.parse()
+    return article.text
+
+def profile_text(url, html):
+    content = extractors.extract(url, html)
+    return content['text'] if content else None
+
+def best_time(fn, *args):
+    result, best = None, float('inf')
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+def token_f1(candidate, reference):
+    candidate, reference = Counter(candidate.lower().split()), Counter(reference.lower().split())
+    overlap = sum((candidate & reference).values())
+    if not overlap:
+        return 0.0
+    precision = overlap / sum(candidate.values())
+    recall = overlap / sum(reference.values())
+    return 2 * precision * recall / (precision + recall)
+
+def main():
+    args = sys.argv[1:]
+    if args[:1] == ['--save']:
+        save_fixtures(args[1], args[2:])
+        return
+    if len(args) != 1:
+        sys.exit(__doc__)
+
+    rows = defaultdict(lambda: {'pages': 0, 'hits': 0, 'profile_s': 0.0, 'newspaper_s': 0.0,
+                                'profile_f1': 0.0, 'newspaper_f1': 0.0})
+    for url, html, gold in load_fixtures(args[0]):
+        profile = extractors.profile_for(url)
+        row = rows[profile.name if profile else 'unprofiled']
+        fast, fast_seconds = best_time(profile_text, url, html)
+        full, full_seconds = best_time(newspaper_text, url, html)
+        reference = gold if gold is not None else full
+
+        row['pages'] += 1
+        row['newspaper_s'] += full_seconds
+        row['newspaper_f1'] += token_f1(full, reference) if gold is not None else 1.0
+        if fast is not None:
+            row['hits'] += 1
+            row['profile_s'] += fast_seconds
+            row['profile_f1'] += token_f1(fast, reference)
+
+    print(f"{'profile':<12}{'pages':>6}{'hits':>6}{'profile ms':>12}{'newspaper ms':>14}{'speedup':>9}{'profile F1':>12}{'newspaper F1':>14}")
+    for name, row in sorted(rows.items()):
+        hits = row['hits']
+        profile_ms = row['profile_s'] / hits * 1000 if hits else float('nan')
+        newspaper_ms = row['newspaper_s'] / row['pages'] * 1000
+        speedup = newspaper_ms / profile_ms if hits else float('nan')
+        profile_f1 = row['profile_f1'] / hits if hits else float('nan')
+        print(f"{name:<12}{row['pages']:>6}{hits:>6}{profile_ms:>12.2f}{newspaper_ms:>14.2f}{speedup:>8.1f}x"
+              f"{profile_f1:>12.3f}{row['newspaper_f1'] / row['pages']:>14.3f}")
+    print("F1 is against <fixture>.txt where present, else against newspaper's own text")
+
+if __name__ == '__main__':
+    main()
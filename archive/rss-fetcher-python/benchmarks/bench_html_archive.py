@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Benchmark: raw_html in the articles row vs. the compressed archive
+Offline, over the bench_extract fixtures: compression ratio and speed of plain
+zstd vs. a per-outlet dictionary (trained on half of an outlet's pages,
+measured on the other half).
+
+With --db, seeds a scratch database with the fixture pages in
+articles.raw_html, reports table sizes and the latency of the publisher's
+article scans, then moves the pages to the archive and measures again (after
+VACUUM, and after VACUUM FULL as for a table that never held the HTML).
+
+Usage: python3 bench_html_archive.py FIXTURE_DIR
+       BENCH_DATABASE_URL=postgresql://... python3 bench_html_archive.py --db FIXTURE_DIR
+
+The database is reset by --db; never point BENCH_DATABASE_URL at a live one.
+"""
+import os
+import sys
+import glob
+import time
+import random
+import statistics
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from urllib.parse import urlparse
+
+FETCHER_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+DATABASE_DIR = os.path.join(FETCHER_DIR, '..', '..', 'database')
+sys.path.insert(0, FETCHER_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import zstandard
+import html_archive
+from bench_extract import load_fixtures
+
+DATABASE_URL = os.environ.get('BENCH_DATABASE_URL')
+ARTICLES = int(os.environ.get('BENCH_ARTICLES', '20000'))
+REPEATS = int(os.environ.get('BENCH_REPEATS', '20'))  # runs per query, median reported
+SEED = 42
+
+# The publisher's article reads (index.py, events.py, events_optimized.py) and a full-table aggregate
+PUBLISHER_SCANS = {
+    'index': """
+        SELECT url, title, published_at, text, outlet
+        FROM articles ORDER BY published_at DESC LIMIT 50
+    """,
+    'events': """
+        SELECT id, url, title, outlet, published_at, text
+        FROM articles
+        WHERE published_at > NOW() - INTERVAL '72 hours' AND text_length > 100
+        ORDER BY published_at DESC LIMIT 300
+    """,
+    'cards': """
+        SELECT a.id, a.url, a.title, a.outlet, a.quality_score, a.published_at, a.summary, a.computed_event_id
+        FROM article_cards a
+        WHERE a.published_at > NOW() - INTERVAL '72 hours' AND a.text_length > 100
+        ORDER BY a.published_at DESC LIMIT 300
+    """,
+    'full-scan': """
+        SELECT outlet, COUNT(*), AVG(text_length) FROM articles GROUP BY outlet
+    """,
+}
+
+def pages_by_outlet(fixture_dir):
+    pages = defaultdict(list)
+    for url, html, _ in load_fixtures(fixture_dir):
+        pages[urlparse(url).hostname].append(html.encode('utf-8'))
+    return pages
+
+def compression_report(fixture_dir):
+    level = html_archive.COMPRESSION_LEVEL
+    print(f"{'outlet':<28}{'pages':>6}{'raw KB':>9}{'zstd':>8}{'dict':>8}{'zstd ms':>9}{'dict ms':>9}")
+    for outlet, pages in sorted(pages_by_outlet(fixture_dir).items()):
+        held_out = pages[1::2] or pages
+        raw = sum(len(page) for page in held_out)
+
+        start = time.perf_counter()
+        plain = sum(len(zstandard.ZstdCompressor(level=level).compress(page)) for page in held_out)
+        plain_ms = (time.perf_counter() - start) / len(held_out) * 1000
+
+        with_dictionary, dictionary_ms = '-', '-'
+        training = pages[::2]
+        if len(pages) >= 4:
+            try:
+                dictionary = zstandard.train_dictionary(html_archive.DICTIONARY_SIZE, training, level=level)
+                dictionary.precompute_compress(level=level)
+                start = time.perf_counter()
+                compressed = sum(len(zstandard.ZstdCompressor(dict_data=dictionary).compress(page))
+                                 for page in held_out)
+                dictionary_ms = f"{(time.perf_counter() - start) / len(held_out) * 1000:.2f}"
+                with_dictionary = f"{raw / compressed:.1f}x"
+            except zstandard.ZstdError:
+                pass
+        print(f"{outlet:<28}{len(pages):>6}{raw / len(held_out) / 1024:>9.1f}{raw / plain:>7.1f}x"
+              f"{with_dictionary:>8}{plain_ms:>9.2f}{dictionary_ms:>9}")
+    print("Ratios are over the held-out half; '-' where the outlet has too few pages to train a dictionary")
+
+# --- Database run ---
+
+def apply_schema(conn):
+    """Create the schema and migrations on an empty database"""
+    cur = conn.cursor()
+    cur.execute("SELECT to_regclass('public.articles')")
+    if cur.fetchone()[0] is not None:
+        return
+    paths = [os.path.join(DATABASE_DIR, 'schema.sql')]
+    paths += sorted(glob.glob(os.path.join(DATABASE_DIR, 'migrations', '*.sql')))
+    for path in paths:
+        with open(path) as f:
+            cur.execute(f.read())
+    conn.commit()
+
+def seed_database(conn, fixture_dir, n):
+    """n articles cycling over the fixture pages, spread over 30 days"""
+    from psycopg2.extras import execute_values
+
+    rng = random.Random(SEED)
+    now = datetime.now(timezone.utc)
+    fixtures = list(load_fixtures(fixture_dir))
+    cur = conn.cursor()
+    cur.execute("TRUNCATE articles, html_dictionaries RESTART IDENTITY CASCADE")
+    rows = []
+    for i in range(n):
+        url, html, _ = fixtures[i % len(fixtures)]
+        text = ' '.join(f"word{rng.randrange(5000)}" for _ in range(600))
+        rows.append((f"{url}#{i}", urlparse(url).hostname, f"Article {i}",
+                     now - timedelta(minutes=rng.randrange(30 * 24 * 60)), text, html,
+                     round(rng.uniform(40, 95), 2), i % 500 + 1))
+    execute_values(cur, """
+        INSERT INTO articles (url, outlet, title, published_at, text, raw_html, quality_score, computed_event_id)
+        VALUES %s
+    """, rows, page_size=500)
+    conn.commit()
+    print(f"Seeded {n} articles over {len(fixtures)} fixture pages")
+
+def vacuum(conn, full=False):
+    conn.autocommit = True
+    conn.cursor().execute(f"VACUUM {'FULL ' if full else ''}ANALYZE articles")
+    conn.autocommit = False
+
+def measure(conn, label):
+    cur = conn.cursor()
+    cur.execute("""
+        SELECT pg_relation_size('articles'),
+               COALESCE(pg_total_relation_size(NULLIF(reltoastrelid, 0)), 0),
+               pg_total_relation_size('articles'),
+               COALESCE(pg_total_relation_size(to_regclass('article_html_archive')), 0)
+        FROM pg_class WHERE oid = 'articles'::regclass
+    """)
+    heap, toast, total, archive = cur.fetchone()
+    timings = {}
+    for name, sql in PUBLISHER_SCANS.items():
+        samples = []
+        for _ in range(REPEATS):
+            start = time.perf_counter()
+            cur.execute(sql)
+            cur.fetchall()
+            samples.append((time.perf_counter() - start) * 1000)
+        timings[name] = statistics.median(samples)
+    conn.rollback()
+    mb = 1024 * 1024
+    print(f"{label:<22}{heap / mb:>9.1f}{toast / mb:>9.1f}{total / mb:>9.1f}{archive / mb:>10.1f}"
+          + ''.join(f"{timings[name]:>12.2f}" for name in PUBLISHER_SCANS))
+
+def database_report(fixture_dir):
+    import psycopg2
+    from sqlalchemy import create_engine
+
+    if not DATABASE_URL:
+        sys.exit("BENCH_DATABASE_URL is required for --db")
+    conn = psycopg2.connect(DATABASE_URL)
+    apply_schema(conn)
+    seed_database(conn, fixture_dir, ARTICLES)
+    vacuum(conn)
+
+    print(f"{'':<22}{'heap MB':>9}{'toast MB':>9}{'total MB':>9}{'archive MB':>10}"
+          + ''.join(f"{name + ' ms':>12}" for name in PUBLISHER_SCANS))
+    measure(conn, 'raw_html in row')
+
+    archive = html_archive.HtmlArchive(create_engine(DATABASE_URL))
+    start = time.perf_counter()
+    archive.backfill()
+    archive.train_dictionaries()
+    backfill_seconds = time.perf_counter() - start
+    vacuum(conn)
+    measure(conn, 'archived + VACUUM')
+    vacuum(conn, full=True)
+    measure(conn, 'archived + VACUUM FULL')
+    print(f"Backfill and dictionary training took {backfill_seconds:.1f}s; "
+          f"pages archived before training use plain zstd")
+    conn.close()
+
+def main():
+    args = sys.argv[1:]
+    if args[:1] == ['--db'] and len(args) == 2:
+        database_report(args[1])
+    elif len(args) == 1:
+        compression_report(args[0])
+    else:
+        sys.exit(__doc__)
+
+if __name__ == '__main__':
+    main()
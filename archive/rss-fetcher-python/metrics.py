@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+RSS fetcher ingest metrics
+Per-host HTTP phase timings (queued/DNS/connect/download from aiohttp tracing), per-feed
+stage timings (download/parse/extract/db), error and byte counters and pipeline
+queue depths, exposed in Prometheus text format
+"""
+import time
+import logging
+import threading
+from collections import defaultdict
+from urllib.parse import urlparse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+HTTP_PHASES = ('queued', 'dns', 'connect', 'download')
+FEED_STAGES = ('download', 'parse', 'extract', 'db')
+QUEUES = ('feeds', 'lookups', 'downloads', 'extractions', 'writes')
+SLOW_FEEDS_LOGGED = 5
+
+def new_timings():
+    """Empty per-request phase timing accumulator (seconds), filled by the trace callbacks"""
+    return defaultdict(float)
+
+def host_of(url):
+    return (urlparse(url).hostname or 'unknown').lower()
+
+def label(value):
+    """Escape a Prometheus label value"""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def trace_config():
+    """aiohttp tracing that adds connection-limit wait, DNS and connect time to the timings passed as trace_request_ctx
+
+    Requests served from the DNS cache or a pooled connection record no time
+    for those phases, so per-host totals show what the host actually cost.
+    """
+    trace = aiohttp.TraceConfig()
+
+    def phase_start(name):
+        async def callback(session, context, params):
+            setattr(context, name, time.perf_counter())
+        return callback
+
+    def phase_end(name):
+        async def callback(session, context, params):
+            started = getattr(context, name, None)
+            if context.trace_request_ctx is not None and started is not None:
+                context.trace_request_ctx[name] += time.perf_counter() - started
+        return callback
+
+    trace.on_connection_queued_start.append(phase_start('queued'))
+    trace.on_connection_queued_end.append(phase_end('queued'))
+    trace.on_dns_resolvehost_start.append(phase_start('dns'))
+    trace.on_dns_resolvehost_end.append(phase_end('dns'))
+    trace.on_connection_create_start.append(phase_start('connect'))
+    trace.on_connection_create_end.append(phase_end('connect'))
+    return trace
+
+class FetcherMetrics:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.phase_seconds = defaultdict(float)  # (host, phase) -> seconds
+        self.requests = defaultdict(int)  # (host, kind) -> requests
+        self.bytes_downloaded = defaultdict(int)  # host -> bytes
+        self.errors = defaultdict(int)  # (host, stage) -> errors
+        self.feed_seconds = defaultdict(float)  # (feed id, stage) -> seconds
+        self.feed_outlets = {}  # feed id -> outlet
+        self.feed_last_seconds = {}  # feed id -> wall time of its last poll
+        self.articles_total = 0
+        self.feeds_total = 0
+        self.cycles_total = 0
+        self.last_cycle_seconds = 0.0
+        self.cycle_feeds = {}  # feed id -> wall seconds, current cycle only
+        self.queues = {}  # name -> asyncio.Queue while a cycle runs
+
+    def record_request(self, kind, url, timings, seconds, size):
+        """One completed HTTP request: phases by host, bytes, request count"""
+        host = host_of(url)
+        timings['download'] = max(seconds - timings['queued'] - timings['dns'] - timings['connect'], 0.0)
+        with self.lock:
+            for phase in HTTP_PHASES:
+                self.phase_seconds[(host, phase)] += timings[phase]
+            self.requests[(host, kind)] += 1
+            self.bytes_downloaded[host] += size
+
+    def record_error(self, stage, url):
+        with self.lock:
+            self.errors[(host_of(url), stage)] += 1
+
+    def record_feed_stage(self, feed, stage, seconds):
+        with self.lock:
+            self.feed_outlets[feed['id']] = feed['outlet']
+            self.feed_seconds[(feed['id'], stage)] += seconds
+
+    def record_feed(self, feed, seconds, new_articles):
+        """A feed finished: its wall time from fetch start to written"""
+        with self.lock:
+            self.feed_outlets[feed['id']] = feed['outlet']
+            self.feed_last_seconds[feed['id']] = seconds
+            self.cycle_feeds[feed['id']] = seconds
+            self.articles_total += new_articles
+            self.feeds_total += 1
+
+    def start_cycle(self, queues):
+        with self.lock:
+            self.cycle_feeds = {}
+            self.queues = dict(queues)
+
+    def end_cycle(self, seconds):
+        """Close a cycle and log the feeds that held it up"""
+        with self.lock:
+            self.queues = {}
+            self.cycles_total += 1
+            self.last_cycle_seconds = seconds
+            slowest = sorted(self.cycle_feeds.items(), key=lambda item: item[1], reverse=True)[:SLOW_FEEDS_LOGGED]
+            outlets = dict(self.feed_outlets)
+        if slowest:
+            logger.info("Slowest feeds: " + ', '.join(
+                f"{outlets.get(feed_id, feed_id)} {seconds:.1f}s" for feed_id, seconds in slowest))
+
+    def render(self):
+        """Prometheus text exposition"""
+        lines = [
+            '# HELP rss_fetcher_http_phase_seconds_total Time spent per HTTP phase, by host',
+            '# TYPE rss_fetcher_http_phase_seconds_total counter',
+        ]
+        with self.lock:
+            for (host, phase), seconds in sorted(self.phase_seconds.items()):
+                lines.append(f'rss_fetcher_http_phase_seconds_total{{host="{label(host)}",phase="{phase}"}} {seconds:.6f}')
+            lines += ['# TYPE rss_fetcher_http_requests_total counter']
+            for (host, kind), count in sorted(self.requests.items()):
+                lines.append(f'rss_fetcher_http_requests_total{{host="{label(host)}",kind="{kind}"}} {count}')
+            lines += ['# TYPE rss_fetcher_bytes_downloaded_total counter']
+            for host, size in sorted(self.bytes_downloaded.items()):
+                lines.append(f'rss_fetcher_bytes_downloaded_total{{host="{label(host)}"}} {size}')
+            lines += ['# TYPE rss_fetcher_errors_total counter']
+            for (host, stage), count in sorted(self.errors.items()):
+                lines.append(f'rss_fetcher_errors_total{{host="{label(host)}",stage="{stage}"}} {count}')
+
+            lines += [
+                '# HELP rss_fetcher_feed_stage_seconds_total Time spent per pipeline stage, by feed',
+                '# TYPE rss_fetcher_feed_stage_seconds_total counter',
+            ]
+            for feed_id in sorted({feed_id for feed_id, _ in self.feed_seconds}):
+                outlet = label(self.feed_outlets.get(feed_id, ''))
+                for stage in FEED_STAGES:
+                    seconds = self.feed_seconds.get((feed_id, stage), 0.0)
+                    lines.append(f'rss_fetcher_feed_stage_seconds_total{{feed="{feed_id}",outlet="{outlet}",stage="{stage}"}} {seconds:.6f}')
+            lines += [
+                '# HELP rss_fetcher_feed_last_seconds Wall time of the feed\'s last poll, fetch to written',
+                '# TYPE rss_fetcher_feed_last_seconds gauge',
+            ]
+            for feed_id, seconds in sorted(self.feed_last_seconds.items()):
+                outlet = label(self.feed_outlets.get(feed_id, ''))
+                lines.append(f'rss_fetcher_feed_last_seconds{{feed="{feed_id}",outlet="{outlet}"}} {seconds:.3f}')
+
+            lines += [
+                '# TYPE rss_fetcher_articles_total counter',
+                f'rss_fetcher_articles_total {self.articles_total}',
+                '# TYPE rss_fetcher_feeds_total counter',
+                f'rss_fetcher_feeds_total {self.feeds_total}',
+                '# TYPE rss_fetcher_cycles_total counter',
+                f'rss_fetcher_cycles_total {self.cycles_total}',
+                '# TYPE rss_fetcher_last_cycle_seconds gauge',
+                f'rss_fetcher_last_cycle_seconds {self.last_cycle_seconds:.3f}',
+                '# TYPE rss_fetcher_queue_depth gauge',
+            ]
+            for name in QUEUES:
+                queue = self.queues.get(name)
+                lines.append(f'rss_fetcher_queue_depth{{queue="{name}"}} {queue.qsize() if queue is not None else 0}')
+        return '\n'.join(lines) + '\n'
+
+    def start_server(self, port):
+        """Serve /metrics from a daemon thread"""
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] not in ('/metrics', '/'):
+                    self.send_error(404)
+                    return
+                body = metrics.render().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer(('0.0.0.0', port), Handler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        logger.info(f"Metrics endpoint listening on :{port}/metrics")
+        return server
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Near-duplicate article detection at ingest
+64-bit SimHash over word shingles of the normalised text. Fingerprints are
+split into four 16-bit bands and candidates come from one indexed band lookup:
+copies within 3 bits always share a band, copies within MAX_HAMMING_DISTANCE
+bits usually do. Unrelated articles differ in about 32 bits.
+"""
+import os
+import re
+import hashlib
+import logging
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+MATCH_WINDOW_HOURS = int(os.getenv("DUPLICATE_WINDOW_HOURS", "72"))
+MAX_HAMMING_DISTANCE = 6  # wire copies with different boilerplate land at 2-8 bits
+NUM_BANDS = 4
+BAND_BITS = 16
+SHINGLE_SIZE = 3
+MIN_TOKENS = 50  # shorter texts (teasers, captions) are not fingerprinted
+MAX_CANDIDATES = 50
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+
+def normalize_tokens(article_text):
+    """Lower-cased word tokens; punctuation, markup remnants and spacing differences drop out"""
+    return TOKEN_PATTERN.findall(article_text.lower())
+
+def _hash64(value):
+    return int.from_bytes(hashlib.blake2b(value.encode('utf-8'), digest_size=8).digest(), 'big')
+
+def simhash(article_text):
+    """Unsigned 64-bit SimHash of the text, or None when it is too short"""
+    tokens = normalize_tokens(article_text or '')
+    if len(tokens) < MIN_TOKENS:
+        return None
+
+    counts = {}
+    for i in range(len(tokens) - SHINGLE_SIZE + 1):
+        shingle = ' '.join(tokens[i:i + SHINGLE_SIZE])
+        counts[shingle] = counts.get(shingle, 0) + 1
+
+    weights = [0] * 64
+    for shingle, count in counts.items():
+        h = _hash64(shingle)
+        for bit in range(64):
+            if h >> bit & 1:
+                weights[bit] += count
+            else:
+                weights[bit] -= count
+    return sum(1 << bit for bit in range(64) if weights[bit] > 0)
+
+def to_signed(value):
+    """Unsigned 64-bit value as a signed BIGINT"""
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+def to_unsigned(value):
+    return value + (1 << 64) if value < 0 else value
+
+def bands(fingerprint):
+    """(band, 16-bit value) pairs of an unsigned fingerprint"""
+    mask = (1 << BAND_BITS) - 1
+    return [(band, fingerprint >> (band * BAND_BITS) & mask) for band in range(NUM_BANDS)]
+
+def hamming(fingerprint1, fingerprint2):
+    return bin(fingerprint1 ^ fingerprint2).count('1')
+
+class DuplicateIndex:
+    def __init__(self, engine):
+        self.engine = engine
+
+    def find_candidates(self, conn, fingerprints, exclude_urls):
+        """Recent articles sharing at least one band value with any of the fingerprints"""
+        band_values = sorted({band for fingerprint in fingerprints for band in bands(fingerprint)})
+        return conn.execute(text("""
+            SELECT DISTINCT a.id, a.simhash, a.canonical_article_id
+            FROM unnest(CAST(:bands AS SMALLINT[]), CAST(:band_values AS INTEGER[])) AS q(band, value)
+            JOIN article_simhash_bands b ON b.band = q.band AND b.value = q.value
+            JOIN articles a ON a.id = b.article_id
+            WHERE b.created_at > NOW() - make_interval(hours => :window)
+              AND a.simhash IS NOT NULL
+              AND a.url <> ALL(:urls)
+            LIMIT :limit
+        """), {
+            "bands": [band for band, _ in band_values],
+            "band_values": [value for _, value in band_values],
+            "urls": list(exclude_urls),
+            "window": MATCH_WINDOW_HOURS,
+            "limit": MAX_CANDIDATES * len(fingerprints)
+        }).mappings().all()
+
+    def match(self, conn, fingerprints):
+        """Canonical copies for a batch of new articles, with one candidate lookup
+
+        fingerprints maps article URL -> fingerprint, in insert order. Returns
+        ({url: canonical article id} for copies of stored articles,
+         {url: earlier url} for copies of an earlier article in the batch).
+        """
+        if not fingerprints:
+            return {}, {}
+
+        # Stored articles and earlier batch entries are both found through their band values
+        by_band = {}
+        for candidate in self.find_candidates(conn, list(fingerprints.values()), list(fingerprints)):
+            fingerprint = to_unsigned(candidate['simhash'])
+            canonical_id = candidate['canonical_article_id'] or candidate['id']
+            for band in bands(fingerprint):
+                by_band.setdefault(band, []).append((fingerprint, canonical_id, None))
+
+        stored, in_batch = {}, {}
+        for url, fingerprint in fingerprints.items():
+            best, best_distance = None, MAX_HAMMING_DISTANCE + 1
+            for band in bands(fingerprint):
+                for other, canonical_id, earlier_url in by_band.get(band, ()):
+                    distance = hamming(fingerprint, other)
+                    if distance < best_distance:
+                        best, best_distance = (canonical_id, earlier_url), distance
+            if best is not None:
+                canonical_id, earlier_url = best
+                if earlier_url is None:
+                    stored[url] = canonical_id
+                else:
+                    # An earlier copy in the batch may itself be a copy
+                    stored_id = stored.get(earlier_url)
+                    if stored_id is not None:
+                        stored[url] = stored_id
+                    else:
+                        in_batch[url] = in_batch.get(earlier_url, earlier_url)
+            for band in bands(fingerprint):
+                by_band.setdefault(band, []).append((fingerprint, None, url))
+        return stored, in_batch
+
+    def link(self, conn, canonical_ids):
+        """Point articles at their canonical copies ({article id: canonical id}) in one statement"""
+        if not canonical_ids:
+            return
+        conn.execute(text("""
+            UPDATE articles a SET canonical_article_id = link.canonical_id
+            FROM unnest(CAST(:ids AS BIGINT[]), CAST(:canonical_ids AS BIGINT[])) AS link(id, canonical_id)
+            WHERE a.id = link.id
+        """), {"ids": list(canonical_ids), "canonical_ids": list(canonical_ids.values())})
+
+    def prune_bands(self):
+        """Drop band values older than the matching window"""
+        with self.engine.begin() as conn:
+            result = conn.execute(text("""
+                DELETE FROM article_simhash_bands
+                WHERE created_at < NOW() - make_interval(hours => :window)
+            """), {"window": MATCH_WINDOW_HOURS})
+        return result.rowcount
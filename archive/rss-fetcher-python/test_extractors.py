@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Checks for the outlet layout profiles against the saved pages in benchmarks/fixtures
+Run with: python -m pytest test_extractors.py
+"""
+import os
+import json
+from datetime import datetime, timezone
+import pytest
+import extractors
+import fetcher
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmarks', 'fixtures')
+
+def load_fixtures():
+    """(url, html, expected body text) for each saved page"""
+    with open(os.path.join(FIXTURE_DIR, 'fixtures.jsonl')) as manifest:
+        fixtures = [json.loads(line) for line in manifest if line.strip()]
+    pages = []
+    for fixture in fixtures:
+        path = os.path.join(FIXTURE_DIR, fixture['file'])
+        with open(path, encoding='utf-8') as f:
+            html = f.read()
+        with open(path + '.txt', encoding='utf-8') as f:
+            pages.append((fixture['url'], html, f.read()))
+    return pages
+
+PAGES = load_fixtures()
+PAGE_PROFILES = {extractors.profile_for(url).name: (url, html) for url, html, _ in PAGES}
+
+def test_every_profile_has_a_saved_page():
+    assert sorted(PAGE_PROFILES) == sorted(profile.name for profile in extractors.PROFILES)
+
+@pytest.mark.parametrize('url, html, expected', PAGES, ids=[url.split('/')[2] for url, _, _ in PAGES])
+def test_profile_extracts_body_paragraphs_only(url, html, expected):
+    content = extractors.extract(url, html)
+    assert content['text'] == expected
+    assert content['published'] == datetime(2025, 3, 14, 9, 30, tzinfo=timezone.utc)
+    assert content['html'] == html
+
+def test_authors_come_from_page_metadata():
+    assert extractors.extract(*PAGE_PROFILES['bbc'])['authors'] == 'Jane Doe'
+    assert extractors.extract(*PAGE_PROFILES['npr'])['authors'] is None
+
+def test_hosts_match_on_domain_boundaries():
+    assert extractors.profile_for('https://www.bbc.com/news/1').name == 'bbc'
+    assert extractors.profile_for('https://feeds.bbc.co.uk/news/1').name == 'bbc'
+    assert extractors.profile_for('https://NEWS.SKY.COM/story/1').name == 'skynews'
+    assert extractors.profile_for('https://notbbc.co.uk/news/1') is None
+    assert extractors.profile_for('https://www.sky.com/watch') is None
+    assert extractors.profile_for('not a url') is None
+
+def test_unknown_layout_or_outlet_is_not_extracted():
+    url, html = PAGE_PROFILES['bbc']
+    changed = html.replace('data-component="text-block"', 'data-component="paragraph"')
+    assert extractors.extract(url, changed) is None
+    assert extractors.extract('https://example.com/story', html) is None
+    assert extractors.extract(url, '') is None
+
+def test_short_profile_text_falls_back_to_full_parser(monkeypatch):
+    url, html = PAGE_PROFILES['dw']
+    monkeypatch.setattr(extractors, 'MIN_BODY_CHARS', 10_000)
+    assert extractors.extract(url, html) is None
+
+    # The fetcher then parses the page with newspaper; extract_article_content does not use self
+    content = fetcher.RSSFetcher.extract_article_content(None, url, html)
+    assert 'independent inquiry' in content['text']
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Checks for the fetcher's pure helpers (no database or network needed)
+Run with: python -m pytest test_fetcher.py
+"""
+from datetime import datetime, timezone
+import fetcher
+from fetcher import normalize_url, EventKeywordIndex, FeedScheduler
+
+def test_normalize_url_drops_tracking_and_fragment():
+    assert normalize_url(" HTTPS://Example.COM/news/story?id=7&utm_source=rss&fbclid=abc#comments ") == \
+        "https://example.com/news/story?id=7"
+    assert normalize_url("https://example.com/a?UTM_Medium=x&gclid=1") == "https://example.com/a"
+
+def test_normalize_url_keeps_meaningful_query_and_path_case():
+    assert normalize_url("https://example.com/Path/Story?page=2&q=") == "https://example.com/Path/Story?page=2&q="
+    assert normalize_url("https://example.com") == "https://example.com/"
+
+def test_normalize_url_rejects_relative_urls():
+    assert normalize_url("/news/story") == ""
+    assert normalize_url("not a url") == ""
+
+EVENTS = [
+    {'id': 1, 'title': 'Flooding in Valencia', 'description': 'Heavy flooding in Valencia after storms'},
+    {'id': 2, 'title': 'Central bank rates', 'description': 'Central bank holds interest rates steady'},
+    {'id': 3, 'title': 'Election results', 'description': None},
+]
+
+def reference_scores(events, title, text):
+    """Per-event keyword scan the index replaces"""
+    article_text = (title + ' ' + text).lower()
+    scores = {}
+    for event in events:
+        words = (event['title'] + ' ' + (event['description'] or '')).lower().split()
+        matched = sum(1 for word in words if len(word) >= fetcher.MIN_KEYWORD_LENGTH and word in article_text)
+        relevance = matched / max(len(words), 1)
+        if relevance > fetcher.EVENT_LINK_THRESHOLD:
+            scores[event['id']] = relevance
+    return scores
+
+ARTICLES = [
+    ('Storms bring flooding to Valencia', 'Streets in Valencia were under water after heavy rain.'),
+    ('Markets wait on the central bank', 'The bank is expected to keep interest rates on hold.'),
+    ('Election results delayed', 'Counting continues in several districts.'),
+    ('Local football', 'The home side won on penalties.'),
+]
+
+def test_event_index_matches_per_event_scan():
+    index = EventKeywordIndex(EVENTS)
+    assert len(index) == len(EVENTS)
+    for title, text in ARTICLES:
+        assert index.score(title, text) == reference_scores(EVENTS, title, text)
+
+def test_event_index_without_automaton_matches():
+    index = EventKeywordIndex(EVENTS)
+    index.automaton = None  # pyahocorasick not installed
+    for title, text in ARTICLES:
+        assert index.score(title, text) == reference_scores(EVENTS, title, text)
+
+def test_event_index_counts_repeated_keywords_and_substrings():
+    index = EventKeywordIndex([{'id': 9, 'title': 'Strike strike', 'description': 'rail'}])
+    # 'strike' occurs twice among the three event words and matches inside 'strikers'
+    assert index.score('Strikers walk out', '') == {9: 2 / 3}
+    assert EventKeywordIndex([]).score('anything', 'at all') == {}
+
+NOW = 1_700_000_000.0
+
+def feed(feed_id, interval_minutes=30, last_fetched=None):
+    return {'id': feed_id, 'outlet': f'outlet{feed_id}', 'url': f'https://example.com/{feed_id}.xml',
+            'fetch_interval_minutes': interval_minutes, 'last_fetched': last_fetched}
+
+def new_scheduler(**kwargs):
+    """Scheduler with a full request bucket at the fixed test clock"""
+    scheduler = FeedScheduler(**kwargs)
+    scheduler.tokens_at = NOW
+    return scheduler
+
+def test_interval_follows_rate_within_bounds():
+    scheduler = new_scheduler()
+    scheduler.rates = {1: 0.0, 2: 1000.0, 3: 4.0}
+    assert scheduler.interval(1) == fetcher.MAX_POLL_MINUTES * 60
+    assert scheduler.interval(2) == fetcher.MIN_POLL_MINUTES * 60
+    assert scheduler.interval(3) == fetcher.TARGET_NEW_PER_POLL / 4.0 * 3600
+
+def test_sync_schedules_new_feeds_and_drops_removed_ones():
+    scheduler = new_scheduler()
+    last = datetime.fromtimestamp(NOW - 600, tz=timezone.utc)
+    scheduler.sync([feed(1), feed(2, last_fetched=last)], {2: 6.0}, now=NOW)
+    # No history: rate from the static interval; history: next poll one interval after the last one
+    assert scheduler.rates[1] == fetcher.TARGET_NEW_PER_POLL * 2
+    assert scheduler.next_due[1] == NOW
+    assert scheduler.next_due[2] == max(NOW, NOW - 600 + scheduler.interval(2))
+
+    scheduler.sync([feed(2)], {}, now=NOW)
+    assert [f['id'] for f in scheduler.pop_due(now=NOW + 86400)] == [2]
+
+def test_observe_updates_rate_and_reschedules():
+    scheduler = new_scheduler()
+    scheduler.sync([feed(1)], {1: 2.0}, now=NOW)
+    assert scheduler.pop_due(now=NOW)
+    scheduler.observe(1, 0, now=NOW)
+    scheduler.observe(1, 10, now=NOW + 3600)
+    assert scheduler.rates[1] == fetcher.RATE_ALPHA * 10 + (1 - fetcher.RATE_ALPHA) * 2.0
+    assert scheduler.next_due[1] == NOW + 3600 + scheduler.interval(1)
+    assert scheduler.pop_due(now=NOW + 3600) == []
+
+def test_budget_limits_polls_and_busiest_feeds_go_first():
+    scheduler = new_scheduler(budget_per_hour=40)  # bucket holds 10 requests
+    feeds = [feed(i) for i in range(1, 16)]
+    scheduler.sync(feeds, {i: float(i) for i in range(1, 16)}, now=NOW)
+
+    polled = [f['id'] for f in scheduler.pop_due(now=NOW)]
+    assert polled == list(range(15, 5, -1))
+    # Over-budget feeds stay due and are polled once tokens refill
+    assert scheduler.pop_due(now=NOW) == []
+    assert scheduler.seconds_until_next(now=NOW) > 0
+    later = [f['id'] for f in scheduler.pop_due(now=NOW + 3600)]
+    assert sorted(later) == list(range(1, 6))
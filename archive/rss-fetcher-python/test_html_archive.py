@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Checks for HTML archive compression with and without outlet dictionaries (no database needed)
+Run with: python -m pytest test_html_archive.py
+"""
+import threading
+import zstandard
+import html_archive
+from html_archive import HtmlArchive
+
+def page(outlet, i):
+    """An article page in one outlet's layout"""
+    nav = ''.join(f'<li class="nav-item"><a href="/{outlet}/section{n}">Section {n}</a></li>' for n in range(30))
+    return (f'<!DOCTYPE html><html><head><title>{outlet} story {i}</title>'
+            f'<link rel="stylesheet" href="/{outlet}/static/site.css"></head><body>'
+            f'<header class="site-header"><ul class="nav">{nav}</ul></header>'
+            f'<article><h1>Headline number {i}</h1><p>Story {i} body text about topic {i * 7 % 13}.</p></article>'
+            f'<footer class="site-footer">&copy; {outlet} media group, all rights reserved</footer></body></html>')
+
+def train(outlet):
+    samples = [page(outlet, i).encode('utf-8') for i in range(200)]
+    return zstandard.train_dictionary(4096, samples, level=html_archive.COMPRESSION_LEVEL).as_bytes()
+
+def test_plain_round_trip():
+    archive = HtmlArchive(engine=None)
+    html = page('example', 1) + ' café — 新闻'
+    dictionary_id, raw_size, compressed = archive.compress('example.com', html)
+    assert dictionary_id is None
+    assert raw_size == len(html.encode('utf-8'))
+    assert len(compressed) < raw_size
+    assert archive.decompress(None, dictionary_id, compressed) == html
+
+def test_empty_page_is_not_archived():
+    assert HtmlArchive(engine=None).compress('example.com', '') is None
+    assert HtmlArchive(engine=None).compress('example.com', None) is None
+
+def test_outlet_dictionary_is_used_and_round_trips():
+    archive = HtmlArchive(engine=None)
+    archive.add_dictionary(3, train('example'), 'example.com')
+    html = page('example', 500)
+
+    dictionary_id, _, with_dictionary = archive.compress('example.com', html)
+    assert dictionary_id == 3
+    assert archive.decompress(None, dictionary_id, with_dictionary) == html
+    _, _, plain = HtmlArchive(engine=None).compress('example.com', html)
+    assert len(with_dictionary) < len(plain)
+
+    # Other outlets keep plain zstd
+    assert archive.compress('other.com', page('other', 1))[0] is None
+
+def test_pages_stay_readable_after_a_newer_dictionary():
+    archive = HtmlArchive(engine=None)
+    archive.add_dictionary(1, train('example'), 'example.com')
+    html = page('example', 7)
+    old = archive.compress('example.com', html)
+    archive.add_dictionary(2, train('example-v2'), 'example.com')
+    assert archive.compress('example.com', html)[0] == 2
+    assert archive.decompress(None, old[0], old[2]) == html
+
+def test_compress_while_dictionaries_change():
+    archive = HtmlArchive(engine=None)
+    dictionaries = [train('example'), train('example-v2')]
+    pages = [page('example', i) for i in range(50)]
+    results, errors = [], []
+
+    def compress():
+        try:
+            results.extend((html, archive.compress('example.com', html)) for html in pages)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=compress) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for dictionary_id in range(1, 21):
+        archive.add_dictionary(dictionary_id, dictionaries[dictionary_id % 2], 'example.com')
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    for html, (dictionary_id, _, compressed) in results:
+        assert archive.decompress(None, dictionary_id, compressed) == html
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Checks for SimHash fingerprints, bands and batch matching (no database needed)
+Run with: python -m pytest test_near_duplicates.py
+"""
+import random
+import near_duplicates
+from near_duplicates import (simhash, bands, hamming, to_signed, to_unsigned, DuplicateIndex,
+                             NUM_BANDS, BAND_BITS, MAX_HAMMING_DISTANCE)
+
+rng = random.Random(47)
+VOCABULARY = [f"word{i}" for i in range(2000)]
+
+def story(words=300):
+    return ' '.join(rng.choice(VOCABULARY) for _ in range(words))
+
+WIRE_STORY = story()
+
+def wire_copy(text, outlet):
+    """Same story under an outlet's credit line, in different case and punctuation"""
+    return f"{outlet}: {text.upper()}."
+
+def test_short_texts_are_not_fingerprinted():
+    assert simhash(story(near_duplicates.MIN_TOKENS - 1)) is None
+    assert simhash('') is None and simhash(None) is None
+
+def test_wire_copies_are_close_and_unrelated_stories_far():
+    original = simhash(WIRE_STORY)
+    copy = simhash(wire_copy(WIRE_STORY, 'Example News'))
+    assert hamming(original, copy) <= MAX_HAMMING_DISTANCE
+    distances = [hamming(original, simhash(story())) for _ in range(20)]
+    assert min(distances) > MAX_HAMMING_DISTANCE
+
+def test_bands_split_the_fingerprint():
+    fingerprint = simhash(WIRE_STORY)
+    parts = bands(fingerprint)
+    assert [band for band, _ in parts] == list(range(NUM_BANDS))
+    assert sum(value << (band * BAND_BITS) for band, value in parts) == fingerprint
+    # Fingerprints within NUM_BANDS - 1 bits always share a band value
+    flipped = fingerprint ^ (1 << 3) ^ (1 << 20) ^ (1 << 40)
+    assert set(bands(fingerprint)) & set(bands(flipped))
+
+def test_signed_round_trip():
+    for value in (0, 1, (1 << 63) - 1, 1 << 63, (1 << 64) - 1):
+        assert -(1 << 63) <= to_signed(value) < 1 << 63
+        assert to_unsigned(to_signed(value)) == value
+
+def index_with(candidates):
+    """DuplicateIndex whose band lookup returns the given stored articles"""
+    index = DuplicateIndex(engine=None)
+    index.find_candidates = lambda conn, fingerprints, exclude_urls: candidates
+    return index
+
+def test_match_links_copies_of_stored_articles_to_their_canonical():
+    stored = simhash(WIRE_STORY)
+    candidates = [{'id': 5, 'simhash': to_signed(stored), 'canonical_article_id': 2}]
+    fingerprints = {'https://b.com/1': simhash(wire_copy(WIRE_STORY, 'B News')),
+                    'https://c.com/1': simhash(story())}
+    assert index_with(candidates).match(None, fingerprints) == ({'https://b.com/1': 2}, {})
+
+def test_match_links_copies_within_a_batch_to_the_first_copy():
+    fingerprints = {'https://a.com/1': simhash(WIRE_STORY),
+                    'https://b.com/1': simhash(wire_copy(WIRE_STORY, 'B News')),
+                    'https://c.com/1': simhash(wire_copy(WIRE_STORY, 'C Daily'))}
+    stored, in_batch = index_with([]).match(None, fingerprints)
+    assert stored == {}
+    assert in_batch == {'https://b.com/1': 'https://a.com/1', 'https://c.com/1': 'https://a.com/1'}
+
+def test_match_prefers_stored_canonical_for_batch_copies():
+    candidates = [{'id': 8, 'simhash': to_signed(simhash(WIRE_STORY)), 'canonical_article_id': None}]
+    fingerprints = {'https://b.com/1': simhash(wire_copy(WIRE_STORY, 'B News')),
+                    'https://c.com/1': simhash(wire_copy(WIRE_STORY, 'C Daily'))}
+    assert index_with(candidates).match(None, fingerprints) == (
+        {'https://b.com/1': 8, 'https://c.com/1': 8}, {})
+    assert index_with([]).match(None, {}) == ({}, {})
@@ -0,0 +1,20 @@
+-- Migration: Add content-hash claim cache
+-- Lets the claim extractor reuse extracted claims for syndicated/duplicate article text
+
+CREATE TABLE IF NOT EXISTS claim_cache (
+    content_hash TEXT PRIMARY KEY,
+    claims JSONB NOT NULL,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+-- Index for pruning entries older than the extractor's CLAIM_CACHE_TTL_HOURS
+CREATE INDEX IF NOT EXISTS idx_claim_cache_created ON claim_cache(created_at);
+
+-- Update schema version tracking
+INSERT INTO schema_versions (version, description, applied_at) VALUES 
+(2, 'Add content-hash claim cache', NOW())
+ON CONFLICT DO NOTHING;
+
+-- Comments for documentation
+COMMENT ON TABLE claim_cache IS 'Extracted claim lists keyed by SHA-256 of normalised article text, shared across outlets carrying the same wire copy';
+COMMENT ON COLUMN claim_cache.claims IS 'JSON list of {text, type, confidence} as produced by extract_claims_from_text';
@@ -0,0 +1,34 @@
+-- Migration: Add cross-article claim clustering
+-- Groups equivalent claims from different outlets so verification can come from independent agreement
+
+-- Cluster assignment, normalised form used for matching, and the article body fingerprint
+ALTER TABLE claims
+ADD COLUMN cluster_id BIGINT DEFAULT NULL,
+ADD COLUMN normalized_text TEXT DEFAULT NULL,
+ADD COLUMN content_hash TEXT DEFAULT NULL;
+
+-- Index for cluster membership queries
+CREATE INDEX idx_claims_cluster ON claims(cluster_id) WHERE cluster_id IS NOT NULL;
+
+-- MinHash LSH band buckets for sub-linear candidate lookup
+CREATE TABLE IF NOT EXISTS claim_lsh_buckets (
+    band SMALLINT NOT NULL,
+    bucket BIGINT NOT NULL,
+    claim_id BIGINT NOT NULL REFERENCES claims(id) ON DELETE CASCADE,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (band, bucket, claim_id)
+);
+
+-- Index for pruning buckets outside the matching window
+CREATE INDEX idx_claim_lsh_buckets_created ON claim_lsh_buckets(created_at);
+
+-- Update schema version tracking
+INSERT INTO schema_versions (version, description, applied_at) VALUES 
+(3, 'Add cross-article claim clustering', NOW())
+ON CONFLICT DO NOTHING;
+
+-- Comments for documentation
+COMMENT ON COLUMN claims.cluster_id IS 'ID of the first claim in the group of equivalent claims across outlets';
+COMMENT ON COLUMN claims.normalized_text IS 'Claim text with numbers, entity aliases and attribution normalised for matching';
+COMMENT ON COLUMN claims.content_hash IS 'Normalised body hash of the claim''s article (the claim_cache key); verbatim wire copies share it';
+COMMENT ON TABLE claim_lsh_buckets IS 'MinHash LSH band hashes of recent claims, pruned after the claim matching window';
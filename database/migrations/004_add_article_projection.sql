@@ -0,0 +1,27 @@
+-- Migration: Add slim article projection for the publisher read path
+-- Event pages only render metadata and a short summary; full text and raw_html stay in TOAST
+
+-- Pre-extracted summary (filled by quality-service) and text length for filtering without detoasting
+ALTER TABLE articles
+ADD COLUMN summary TEXT DEFAULT NULL,
+ADD COLUMN text_length INTEGER GENERATED ALWAYS AS (LENGTH(text)) STORED;
+
+-- Covering index for the recent-articles scan; wide string columns are read from the heap tuple
+CREATE INDEX idx_articles_recent_cards ON articles(published_at DESC)
+INCLUDE (id, quality_score, computed_event_id, text_length)
+WHERE text_length > 100;
+
+-- Projection-only view of the columns needed to render event listings
+CREATE OR REPLACE VIEW article_cards AS
+SELECT id, url, title, outlet, published_at, quality_score, computed_event_id, summary, text_length
+FROM articles;
+
+-- Update schema version tracking
+INSERT INTO schema_versions (version, description, applied_at) VALUES
+(4, 'Add slim article projection for publisher', NOW())
+ON CONFLICT DO NOTHING;
+
+-- Comments for documentation
+COMMENT ON COLUMN articles.summary IS 'Short extractive summary (first sentences of text) computed by quality-service';
+COMMENT ON COLUMN articles.text_length IS 'Length of article text, stored so filters do not need to detoast text';
+COMMENT ON VIEW article_cards IS 'Rendering columns of articles without text or raw_html';
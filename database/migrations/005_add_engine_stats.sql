@@ -0,0 +1,97 @@
+-- Migration: Add incrementally maintained row counters
+-- Publisher header counters read these instead of running COUNT(*) scans on every page view
+
+-- One row per counted table, holding the count as of the last compaction
+CREATE TABLE IF NOT EXISTS engine_stats (
+    name TEXT PRIMARY KEY,
+    value BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+-- Changes not yet folded into engine_stats. Writers only ever append here, so concurrent
+-- write transactions never wait on a shared counter row lock
+CREATE TABLE IF NOT EXISTS engine_stats_deltas (
+    name TEXT NOT NULL,
+    delta BIGINT NOT NULL
+);
+
+-- Statement-level triggers: one delta row per INSERT/DELETE statement, not per row
+CREATE OR REPLACE FUNCTION engine_stats_add_inserted() RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO engine_stats_deltas (name, delta)
+    SELECT TG_TABLE_NAME, COUNT(*) FROM inserted_rows;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION engine_stats_subtract_deleted() RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO engine_stats_deltas (name, delta)
+    SELECT TG_TABLE_NAME, -COUNT(*) FROM deleted_rows;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- TRUNCATE holds an exclusive lock on the table, so no delta for it can be in flight
+CREATE OR REPLACE FUNCTION engine_stats_reset() RETURNS TRIGGER AS $$
+BEGIN
+    DELETE FROM engine_stats_deltas WHERE name = TG_TABLE_NAME;
+    UPDATE engine_stats SET value = 0, updated_at = NOW() WHERE name = TG_TABLE_NAME;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Fold committed deltas into engine_stats (run every PAGE_REFRESH_INTERVAL by the publisher
+-- refresh loop in services/publisher/start.sh, one per replica). Concurrent
+-- compactions cannot double count: a delta row is deleted, and so moved, by one of them only
+CREATE OR REPLACE FUNCTION engine_stats_compact() RETURNS VOID AS $$
+BEGIN
+    WITH moved AS (
+        DELETE FROM engine_stats_deltas RETURNING name, delta
+    )
+    UPDATE engine_stats s SET value = s.value + m.total, updated_at = NOW()
+    FROM (SELECT name, SUM(delta) AS total FROM moved GROUP BY name) m
+    WHERE s.name = m.name;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER articles_stats_insert AFTER INSERT ON articles
+REFERENCING NEW TABLE AS inserted_rows
+FOR EACH STATEMENT EXECUTE FUNCTION engine_stats_add_inserted();
+
+CREATE TRIGGER articles_stats_delete AFTER DELETE ON articles
+REFERENCING OLD TABLE AS deleted_rows
+FOR EACH STATEMENT EXECUTE FUNCTION engine_stats_subtract_deleted();
+
+CREATE TRIGGER articles_stats_truncate AFTER TRUNCATE ON articles
+FOR EACH STATEMENT EXECUTE FUNCTION engine_stats_reset();
+
+CREATE TRIGGER events_stats_insert AFTER INSERT ON events
+REFERENCING NEW TABLE AS inserted_rows
+FOR EACH STATEMENT EXECUTE FUNCTION engine_stats_add_inserted();
+
+CREATE TRIGGER events_stats_delete AFTER DELETE ON events
+REFERENCING OLD TABLE AS deleted_rows
+FOR EACH STATEMENT EXECUTE FUNCTION engine_stats_subtract_deleted();
+
+CREATE TRIGGER events_stats_truncate AFTER TRUNCATE ON events
+FOR EACH STATEMENT EXECUTE FUNCTION engine_stats_reset();
+
+-- Seed the counters (runs in the migration transaction together with the triggers)
+INSERT INTO engine_stats (name, value)
+SELECT 'articles', COUNT(*) FROM articles
+ON CONFLICT (name) DO UPDATE SET value = EXCLUDED.value, updated_at = NOW();
+
+INSERT INTO engine_stats (name, value)
+SELECT 'events', COUNT(*) FROM events
+ON CONFLICT (name) DO UPDATE SET value = EXCLUDED.value, updated_at = NOW();
+
+-- Update schema version tracking
+INSERT INTO schema_versions (version, description, applied_at) VALUES
+(5, 'Add incrementally maintained row counters', NOW())
+ON CONFLICT DO NOTHING;
+
+-- Comments for documentation
+COMMENT ON TABLE engine_stats IS 'Row counters read by publisher header counters; current count is value plus pending engine_stats_deltas';
+COMMENT ON COLUMN engine_stats.value IS 'Row count of the table named by name as of the last engine_stats_compact()';
+COMMENT ON TABLE engine_stats_deltas IS 'Append-only row count changes written by statement-level triggers, folded into engine_stats by engine_stats_compact()';
@@ -0,0 +1,18 @@
+-- Migration: Add HTTP validators to RSS feeds
+-- Lets the fetcher send conditional requests and skip parsing unchanged feeds
+
+-- Validators from the last successful fetch
+ALTER TABLE rss_feeds
+ADD COLUMN etag TEXT DEFAULT NULL,
+ADD COLUMN last_modified TEXT DEFAULT NULL,
+ADD COLUMN content_hash TEXT DEFAULT NULL;
+
+-- Update schema version tracking
+INSERT INTO schema_versions (version, description, applied_at) VALUES
+(6, 'Add HTTP validators to RSS feeds', NOW())
+ON CONFLICT DO NOTHING;
+
+-- Comments for documentation
+COMMENT ON COLUMN rss_feeds.etag IS 'ETag of the last fetched feed body, sent as If-None-Match';
+COMMENT ON COLUMN rss_feeds.last_modified IS 'Last-Modified of the last fetched feed body, sent as If-Modified-Since';
+COMMENT ON COLUMN rss_feeds.content_hash IS 'SHA-256 of the last fetched feed body; identical bodies are not parsed again';
@@ -0,0 +1,35 @@
+-- Migration: Add near-duplicate detection for syndicated articles
+-- SimHash fingerprints computed at ingest link wire copies to one canonical article
+
+-- Fingerprint and canonical copy
+ALTER TABLE articles
+ADD COLUMN simhash BIGINT DEFAULT NULL,
+ADD COLUMN canonical_article_id BIGINT DEFAULT NULL REFERENCES articles(id) ON DELETE SET NULL;
+
+-- Index for exact fingerprint lookups
+CREATE INDEX idx_articles_simhash ON articles(simhash) WHERE simhash IS NOT NULL;
+
+-- Index for cluster membership queries (outlets carrying the same copy)
+CREATE INDEX idx_articles_canonical ON articles(canonical_article_id) WHERE canonical_article_id IS NOT NULL;
+
+-- 16-bit SimHash bands: fingerprints within 3 bits share at least one band value
+CREATE TABLE IF NOT EXISTS article_simhash_bands (
+    band SMALLINT NOT NULL,
+    value INTEGER NOT NULL,
+    article_id BIGINT NOT NULL REFERENCES articles(id) ON DELETE CASCADE,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (band, value, article_id)
+);
+
+-- Index for pruning bands outside the matching window
+CREATE INDEX idx_article_simhash_bands_created ON article_simhash_bands(created_at);
+
+-- Update schema version tracking
+INSERT INTO schema_versions (version, description, applied_at) VALUES
+(7, 'Add near-duplicate detection for syndicated articles', NOW())
+ON CONFLICT DO NOTHING;
+
+-- Comments for documentation
+COMMENT ON COLUMN articles.simhash IS '64-bit SimHash of the normalised article text (signed for BIGINT storage)';
+COMMENT ON COLUMN articles.canonical_article_id IS 'First stored copy of a near-identical article; NULL for canonical articles';
+COMMENT ON TABLE article_simhash_bands IS 'SimHash band values of recent articles, pruned after the duplicate matching window';
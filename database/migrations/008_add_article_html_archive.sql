@@ -0,0 +1,42 @@
+-- Migration: Move raw article HTML out of the articles table
+-- Raw pages are kept zstd-compressed in an append-only archive read by article id; articles.raw_html
+-- stays for writers that have not moved yet and is emptied by the fetcher's backfill
+
+-- Shared zstd dictionaries trained on one outlet's pages (pages of one layout share most of their markup)
+CREATE TABLE IF NOT EXISTS html_dictionaries (
+    id SERIAL PRIMARY KEY,
+    outlet TEXT NOT NULL,
+    dictionary BYTEA NOT NULL,
+    sample_count INTEGER NOT NULL,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+-- Index for loading the newest dictionary of each outlet
+CREATE INDEX idx_html_dictionaries_outlet ON html_dictionaries(outlet, id DESC);
+
+-- One compressed page per article, written once
+CREATE TABLE IF NOT EXISTS article_html_archive (
+    article_id BIGINT PRIMARY KEY REFERENCES articles(id) ON DELETE CASCADE,
+    dictionary_id INTEGER DEFAULT NULL REFERENCES html_dictionaries(id),
+    raw_size INTEGER NOT NULL,
+    compressed BYTEA NOT NULL,
+    archived_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+-- Compressed pages gain nothing from TOAST compression
+ALTER TABLE article_html_archive ALTER COLUMN compressed SET STORAGE EXTERNAL;
+
+-- Index for finding rows the backfill has not moved yet
+CREATE INDEX idx_articles_raw_html_pending ON articles(id) WHERE raw_html IS NOT NULL;
+
+-- Update schema version tracking
+INSERT INTO schema_versions (version, description, applied_at) VALUES
+(8, 'Move raw article HTML to a compressed archive', NOW())
+ON CONFLICT DO NOTHING;
+
+-- Comments for documentation
+COMMENT ON TABLE html_dictionaries IS 'zstd dictionaries trained per outlet for compressing archived HTML';
+COMMENT ON TABLE article_html_archive IS 'Append-only zstd-compressed raw HTML of articles, read lazily by article id';
+COMMENT ON COLUMN article_html_archive.dictionary_id IS 'Dictionary the page was compressed with; NULL for plain zstd';
+COMMENT ON COLUMN article_html_archive.raw_size IS 'Size of the uncompressed HTML in bytes';
+COMMENT ON COLUMN articles.raw_html IS 'Deprecated: raw HTML now lives in article_html_archive; NULL once archived';
@@ -0,0 +1,22 @@
+-- Migration: Track articles the claim extractor failed on
+-- Failed articles are retried with exponential backoff instead of being selected again in every batch
+
+CREATE TABLE IF NOT EXISTS claim_extraction_failures (
+    article_id BIGINT PRIMARY KEY REFERENCES articles(id) ON DELETE CASCADE,
+    attempts INT NOT NULL DEFAULT 1,
+    last_error TEXT,
+    failed_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    retry_after TIMESTAMPTZ NOT NULL
+);
+
+-- Index for excluding articles still in backoff
+CREATE INDEX IF NOT EXISTS idx_claim_extraction_failures_retry ON claim_extraction_failures(retry_after);
+
+-- Update schema version tracking
+INSERT INTO schema_versions (version, description, applied_at) VALUES
+(9, 'Track claim extraction failures for retry backoff', NOW())
+ON CONFLICT DO NOTHING;
+
+-- Comments for documentation
+COMMENT ON TABLE claim_extraction_failures IS 'Articles whose claim extraction raised, with the time they may be retried';
+COMMENT ON COLUMN claim_extraction_failures.retry_after IS 'Article is not selected for extraction before this time; infinity once attempts are exhausted';
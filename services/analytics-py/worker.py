@@ -57,7 +57,7 @@ def fetch_event_article_data(engine, event_id):
 
 def fetch_event_claims(engine, event_id):
     sql = '''
-    SELECT c.id, c.article_id, c.claim_text, c.verified_state
+    SELECT c.id, c.article_id, c.claim_text, c.verified_state, c.cluster_id
     FROM claims c
     JOIN event_articles ea ON ea.article_id = c.article_id
     WHERE ea.event_id = :eid
@@ -171,9 +171,18 @@ def score_best_source(articles, claims, outlet_profiles):
 def score_corroboration(claims):
     if not claims:
         return 0.0, 0.0, 0.0
-    total = len(claims)
-    verified = sum(1 for c in claims if (c["verified_state"] or "").lower()=="verified")
-    contested = sum(1 for c in claims if (c["verified_state"] or "").lower()=="contested")
+    # Equivalent claims across outlets share a cluster; count each cluster once
+    states = {}
+    for c in claims:
+        key = c.get("cluster_id") or ("claim", c["id"])
+        state = (c["verified_state"] or "").lower()
+        if states.get(key) not in ("verified", "contested"):
+            states[key] = state
+        elif state == "verified":
+            states[key] = state
+    total = len(states)
+    verified = sum(1 for s in states.values() if s=="verified")
+    contested = sum(1 for s in states.values() if s=="contested")
     contradiction_rate = contested/total
     ratio = verified/total
     score = 100.0 * ratio * (1.0 - contradiction_rate)
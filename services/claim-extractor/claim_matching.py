@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Cross-article claim matching
+Normalises claims and indexes them with MinHash/LSH so equivalent claims from
+different outlets are grouped without comparing against every stored claim
+"""
+import os
+import re
+import random
+import struct
+import hashlib
+import logging
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+MATCH_WINDOW_HOURS = int(os.getenv("CLAIM_MATCH_WINDOW_HOURS", "72"))
+MATCH_THRESHOLD = float(os.getenv("CLAIM_MATCH_THRESHOLD", "0.6"))  # shingle Jaccard
+MIN_CORROBORATING_OUTLETS = int(os.getenv("MIN_CORROBORATING_OUTLETS", "2"))
+MAX_CANDIDATES = 200
+
+# 16 bands x 4 rows: claims with Jaccard ~0.5+ very likely share a bucket
+NUM_BANDS = 16
+ROWS_PER_BAND = 4
+NUM_PERM = NUM_BANDS * ROWS_PER_BAND
+MERSENNE_PRIME = (1 << 61) - 1
+
+# Fixed seed so signatures are stable across processes and restarts
+_rng = random.Random(20240101)
+PERMUTATIONS = [(_rng.randrange(1, MERSENNE_PRIME), _rng.randrange(0, MERSENNE_PRIME))
+                for _ in range(NUM_PERM)]
+
+NUMBER_SCALES = {'thousand': 1e3, 'million': 1e6, 'billion': 1e9, 'trillion': 1e12}
+
+ENTITY_ALIASES = [
+    (r'\bu\.s\.a?\.?(?=\s|$)', 'us'),
+    (r'\bunited states( of america)?\b', 'us'),
+    (r'\bamerica\b', 'us'),
+    (r'\bu\.k\.(?=\s|$)', 'uk'),
+    (r'\bunited kingdom\b', 'uk'),
+    (r'\bbritain\b', 'uk'),
+    (r'\bu\.n\.(?=\s|$)', 'un'),
+    (r'\bunited nations\b', 'un'),
+    (r'\beuropean union\b', 'eu'),
+    (r'\bkiev\b', 'kyiv'),
+]
+
+# Attribution and hedging differ between outlets reporting the same claim
+ATTRIBUTION_PATTERNS = [
+    r'according to [^,.]+,?',
+    r'\b(officials|experts|sources|analysts|authorities|police|researchers)\s+(said|say|says|confirmed|claim|claimed|told \w+)\b',
+    r'\b(he|she|they|it) (said|says|added)\b',
+    r'\b(reportedly|allegedly|officially)\b',
+]
+
+STOP_WORDS = {
+    'a', 'an', 'the', 'and', 'or', 'but', 'of', 'in', 'on', 'at', 'to', 'for', 'by',
+    'with', 'from', 'as', 'is', 'are', 'was', 'were', 'be', 'been', 'has', 'have', 'had',
+    'that', 'this', 'which', 'who', 'its', 'it', 'their', 'there', 'than', 'some',
+}
+
+def _format_number(value):
+    """Canonical numeric token: integers without separators, otherwise 2 decimals"""
+    if value == int(value):
+        return str(int(value))
+    return f"{value:.2f}".rstrip('0')
+
+def normalize_claim(claim_text):
+    """Normalise numbers, entity aliases and attribution so equivalent claims compare equal"""
+    t = (claim_text or '').lower()
+
+    for pattern in ATTRIBUTION_PATTERNS:
+        t = re.sub(pattern, ' ', t)
+    for pattern, alias in ENTITY_ALIASES:
+        t = re.sub(pattern, alias, t)
+
+    # Numbers: thousands separators, percent spellings, scale words
+    t = re.sub(r'(?<=\d),(?=\d{3}\b)', '', t)
+    t = re.sub(r'\s*\b(per\s*cent|percent)\b', '%', t)
+    t = re.sub(r'(\d+(?:\.\d+)?)\s*(thousand|million|billion|trillion)\b',
+               lambda m: _format_number(float(m.group(1)) * NUMBER_SCALES[m.group(2)]), t)
+    t = re.sub(r"'s\b", '', t)
+
+    tokens = re.findall(r'\d+(?:\.\d+)?%?|[a-z]+', t)
+    return ' '.join(tok for tok in tokens if tok not in STOP_WORDS)
+
+def claim_shingles(normalized_text):
+    """Unigram and bigram shingles of a normalised claim"""
+    tokens = normalized_text.split()
+    shingles = set(tokens)
+    shingles.update(f"{a} {b}" for a, b in zip(tokens, tokens[1:]))
+    return shingles
+
+def _hash64(value):
+    return int.from_bytes(hashlib.blake2b(value.encode('utf-8'), digest_size=8).digest(), 'big')
+
+def minhash_signature(shingles):
+    """MinHash signature over NUM_PERM universal hash permutations"""
+    hashes = [_hash64(s) for s in shingles]
+    return [min((a * h + b) % MERSENNE_PRIME for h in hashes) for a, b in PERMUTATIONS]
+
+def lsh_buckets(signature):
+    """(band, bucket) pairs for a signature; bucket is a signed 64-bit hash for BIGINT storage"""
+    buckets = []
+    for band in range(NUM_BANDS):
+        rows = signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND]
+        digest = hashlib.blake2b(struct.pack(f'>{ROWS_PER_BAND}Q', *rows), digest_size=8).digest()
+        buckets.append((band, int.from_bytes(digest, 'big', signed=True)))
+    return buckets
+
+def jaccard(set1, set2):
+    """Jaccard similarity of two shingle sets"""
+    if not set1 or not set2:
+        return 0.0
+    return len(set1 & set2) / len(set1 | set2)
+
+def outlet_group(outlet, outlet_profiles):
+    """Independence group for an outlet (outlets sharing an owner count once)"""
+    key = (outlet or '').lower()
+    return outlet_profiles.get(key) or key
+
+def corroboration_groups(articles, outlet_profiles):
+    """Number of independent sources among the articles carrying a claim
+
+    articles are (outlet, canonical article id, body hash) rows. Articles
+    linked by a shared canonical copy or an identical body are one wire story
+    however many outlets ran it; any other article counts as its outlet's
+    independence group, so outlets sharing an owner count once.
+    """
+    parent = {}
+
+    def find(key):
+        parent.setdefault(key, key)
+        while parent[key] != key:
+            parent[key] = parent[parent[key]]
+            key = parent[key]
+        return key
+
+    for _, canonical_id, body_hash in articles:
+        if body_hash:
+            parent[find(('body', body_hash))] = find(('canonical', canonical_id))
+
+    stories = {}
+    for outlet, canonical_id, _ in articles:
+        stories.setdefault(find(('canonical', canonical_id)), set()).add(outlet_group(outlet, outlet_profiles))
+    sources = set()
+    for story, groups in stories.items():
+        sources.add(('story', story) if len(groups) > 1 else ('outlet', next(iter(groups))))
+    return len(sources)
+
+class ClaimMatcher:
+    def __init__(self, engine):
+        self.engine = engine
+        self.outlet_profiles = {}
+        self.load_outlet_profiles()
+
+    def load_outlet_profiles(self):
+        """Load outlet independence groups"""
+        sql = "SELECT domain, COALESCE(independence_group, domain) AS grp FROM outlet_profiles"
+        try:
+            with self.engine.begin() as conn:
+                rows = conn.execute(text(sql)).mappings().all()
+            self.outlet_profiles = {r['domain'].lower(): r['grp'].lower() for r in rows}
+        except Exception as e:
+            logger.warning(f"Could not load outlet profiles, treating every outlet as independent: {e}")
+            self.outlet_profiles = {}
+
+    def find_candidates(self, conn, buckets):
+        """Claims within the matching window sharing at least one LSH bucket"""
+        sql = """
+            SELECT DISTINCT c.id, c.cluster_id, c.normalized_text
+            FROM unnest(CAST(:bands AS SMALLINT[]), CAST(:buckets AS BIGINT[])) AS q(band, bucket)
+            JOIN claim_lsh_buckets b ON b.band = q.band AND b.bucket = q.bucket
+            JOIN claims c ON c.id = b.claim_id
+            WHERE b.created_at > NOW() - make_interval(hours => :window)
+            LIMIT :limit
+        """
+        return conn.execute(text(sql), {
+            "bands": [band for band, _ in buckets],
+            "buckets": [bucket for _, bucket in buckets],
+            "window": MATCH_WINDOW_HOURS,
+            "limit": MAX_CANDIDATES
+        }).mappings().all()
+
+    def match_claim(self, conn, claim_id, claim_text):
+        """Assign a freshly inserted claim to a cluster and update cluster verification"""
+        normalized = normalize_claim(claim_text)
+        shingles = claim_shingles(normalized)
+
+        cluster_id = claim_id
+        buckets = []
+        if len(shingles) >= 3:  # Too little content to match reliably
+            buckets = lsh_buckets(minhash_signature(shingles))
+            best_score = 0.0
+            for candidate in self.find_candidates(conn, buckets):
+                score = jaccard(shingles, claim_shingles(candidate['normalized_text'] or ''))
+                if score >= MATCH_THRESHOLD and score > best_score:
+                    best_score = score
+                    cluster_id = candidate['cluster_id'] or candidate['id']
+
+        conn.execute(text("""
+            UPDATE claims SET cluster_id = :cluster_id, normalized_text = :normalized
+            WHERE id = :id
+        """), {"cluster_id": cluster_id, "normalized": normalized, "id": claim_id})
+
+        if buckets:
+            conn.execute(text("""
+                INSERT INTO claim_lsh_buckets (band, bucket, claim_id)
+                VALUES (:band, :bucket, :claim_id)
+                ON CONFLICT DO NOTHING
+            """), [{"band": band, "bucket": bucket, "claim_id": claim_id} for band, bucket in buckets])
+
+        if cluster_id != claim_id:
+            self.update_cluster_verification(conn, cluster_id)
+        return cluster_id
+
+    def update_cluster_verification(self, conn, cluster_id):
+        """Mark a cluster verified once enough independent sources carry the claim"""
+        articles = conn.execute(text("""
+            SELECT DISTINCT a.outlet, COALESCE(a.canonical_article_id, a.id), c.content_hash
+            FROM claims c
+            JOIN articles a ON a.id = c.article_id
+            WHERE c.cluster_id = :cluster_id AND a.outlet IS NOT NULL
+        """), {"cluster_id": cluster_id}).all()
+
+        if corroboration_groups(articles, self.outlet_profiles) < MIN_CORROBORATING_OUTLETS:
+            return False
+        outlets = {outlet for outlet, _, _ in articles}
+
+        # Contested claims keep their state; agreement does not settle a dispute
+        conn.execute(text("""
+            UPDATE claims
+            SET verified_state = 'verified', verification_source = :source
+            WHERE cluster_id = :cluster_id
+              AND verified_state IN ('unverified', 'verified')
+        """), {"cluster_id": cluster_id, "source": ', '.join(sorted(outlets))[:500]})
+        return True
+
+    def prune_buckets(self):
+        """Drop LSH buckets older than the matching window"""
+        with self.engine.begin() as conn:
+            result = conn.execute(text("""
+                DELETE FROM claim_lsh_buckets
+                WHERE created_at < NOW() - make_interval(hours => :window)
+            """), {"window": MATCH_WINDOW_HOURS})
+        return result.rowcount
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Claim extractor throughput metrics and profiling hooks
+Per-stage timings, articles/sec and queue depth exposed in Prometheus text format
+"""
+import os
+import time
+import heapq
+import logging
+import threading
+import cProfile
+from collections import deque, defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger(__name__)
+
+STAGES = ('cache', 'parse', 'regex', 'classify', 'verify', 'db')
+RATE_WINDOW_SECONDS = 300
+QUEUE_DEPTH_TTL_SECONDS = 15
+
+def new_timings():
+    """Empty per-article stage timing accumulator (seconds)"""
+    return defaultdict(float)
+
+def format_timings(timings):
+    """Compact log representation of stage timings in milliseconds"""
+    return ' '.join(f"{stage}={timings.get(stage, 0.0) * 1000:.0f}ms" for stage in STAGES)
+
+class ExtractorMetrics:
+    def __init__(self, queue_depth_fn=None):
+        self.lock = threading.Lock()
+        self.queue_depth_fn = queue_depth_fn
+        self.stage_seconds = defaultdict(float)
+        self.articles_total = 0
+        self.errors_total = 0
+        self.batches_total = 0
+        self.last_batch_seconds = 0.0
+        self.completions = deque()  # completion timestamps inside the rate window
+        self.queue_depth = None
+        self.queue_depth_at = 0.0
+
+    def record_article(self, timings):
+        """Add one processed article's stage timings"""
+        now = time.time()
+        with self.lock:
+            for stage, seconds in timings.items():
+                self.stage_seconds[stage] += seconds
+            self.articles_total += 1
+            self.completions.append(now)
+            self._trim(now)
+
+    def record_error(self):
+        with self.lock:
+            self.errors_total += 1
+
+    def record_batch(self, seconds):
+        with self.lock:
+            self.batches_total += 1
+            self.last_batch_seconds = seconds
+
+    def _trim(self, now):
+        while self.completions and self.completions[0] < now - RATE_WINDOW_SECONDS:
+            self.completions.popleft()
+
+    def articles_per_second(self):
+        """Throughput over the trailing rate window"""
+        now = time.time()
+        with self.lock:
+            self._trim(now)
+            if not self.completions:
+                return 0.0
+            elapsed = max(now - self.completions[0], 1.0)
+            return len(self.completions) / elapsed
+
+    def get_queue_depth(self):
+        """Articles awaiting extraction, cached briefly so scrapes stay cheap"""
+        if self.queue_depth_fn is None:
+            return None
+        now = time.time()
+        if self.queue_depth is None or now - self.queue_depth_at > QUEUE_DEPTH_TTL_SECONDS:
+            try:
+                self.queue_depth = self.queue_depth_fn()
+                self.queue_depth_at = now
+            except Exception as e:
+                logger.warning(f"Failed to read extraction queue depth: {e}")
+        return self.queue_depth
+
+    def render(self):
+        """Prometheus text exposition"""
+        rate = self.articles_per_second()
+        depth = self.get_queue_depth()
+        lines = [
+            '# HELP claim_extractor_stage_seconds_total Time spent per processing stage',
+            '# TYPE claim_extractor_stage_seconds_total counter',
+        ]
+        with self.lock:
+            for stage in STAGES:
+                lines.append(f'claim_extractor_stage_seconds_total{{stage="{stage}"}} {self.stage_seconds.get(stage, 0.0):.6f}')
+            lines += [
+                '# TYPE claim_extractor_articles_total counter',
+                f'claim_extractor_articles_total {self.articles_total}',
+                '# TYPE claim_extractor_errors_total counter',
+                f'claim_extractor_errors_total {self.errors_total}',
+                '# TYPE claim_extractor_batches_total counter',
+                f'claim_extractor_batches_total {self.batches_total}',
+                '# TYPE claim_extractor_last_batch_seconds gauge',
+                f'claim_extractor_last_batch_seconds {self.last_batch_seconds:.3f}',
+            ]
+        lines += [
+            '# TYPE claim_extractor_articles_per_second gauge',
+            f'claim_extractor_articles_per_second {rate:.3f}',
+        ]
+        if depth is not None:
+            lines += [
+                '# TYPE claim_extractor_queue_depth gauge',
+                f'claim_extractor_queue_depth {depth}',
+            ]
+        return '\n'.join(lines) + '\n'
+
+    def start_server(self, port):
+        """Serve /metrics from a daemon thread"""
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] not in ('/metrics', '/'):
+                    self.send_error(404)
+                    return
+                body = metrics.render().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer(('0.0.0.0', port), Handler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        logger.info(f"Metrics endpoint listening on :{port}/metrics")
+        return server
+
+class SlowestArticleProfiler:
+    """Profile every article and keep dumps for the N slowest (per process)"""
+
+    def __init__(self, keep, output_dir, backend='cprofile'):
+        self.keep = keep
+        self.output_dir = output_dir
+        self.backend = backend
+        self.slowest = []  # min-heap of (seconds, path)
+        os.makedirs(output_dir, exist_ok=True)
+
+        if backend == 'pyinstrument':
+            try:
+                import pyinstrument  # noqa: F401
+            except ImportError:
+                logger.warning("pyinstrument not installed, falling back to cProfile")
+                self.backend = 'cprofile'
+
+    def start(self):
+        if self.backend == 'pyinstrument':
+            from pyinstrument import Profiler
+            profiler = Profiler()
+            profiler.start()
+        else:
+            profiler = cProfile.Profile()
+            profiler.enable()
+        return profiler
+
+    def stop(self, profiler, article_id, seconds):
+        """Stop profiling and dump the result if it is among the N slowest"""
+        if self.backend == 'cprofile':
+            profiler.disable()
+        else:
+            profiler.stop()
+
+        if len(self.slowest) >= self.keep and seconds <= self.slowest[0][0]:
+            return
+
+        ext = 'html' if self.backend == 'pyinstrument' else 'prof'
+        path = os.path.join(self.output_dir, f"article-{article_id}-{os.getpid()}.{ext}")
+        if self.backend == 'cprofile':
+            profiler.dump_stats(path)
+        else:
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(profiler.output_html())
+
+        heapq.heappush(self.slowest, (seconds, path))
+        if len(self.slowest) > self.keep:
+            _, evicted = heapq.heappop(self.slowest)
+            try:
+                os.remove(evicted)
+            except OSError:
+                pass
+        logger.info(f"Saved profile for slow article {article_id} ({seconds:.2f}s) to {path}")
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Checks for cross-article claim matching (pure functions, no database)
+Run with: python -m pytest test_claim_matching.py
+"""
+from claim_matching import (normalize_claim, claim_shingles, minhash_signature, lsh_buckets,
+                            jaccard, outlet_group, corroboration_groups, NUM_BANDS)
+
+def shingles(claim_text):
+    return claim_shingles(normalize_claim(claim_text))
+
+def test_normalize_numbers_aliases_and_attribution():
+    first = normalize_claim("According to officials, the United States lost 1,200 jobs, up 5 per cent.")
+    second = normalize_claim("The U.S. lost 1200 jobs, up 5%, officials said")
+    assert first == second
+    assert normalize_claim("Exports reached 2.5 million tonnes") == normalize_claim("Exports reached 2500000 tonnes")
+
+def test_equivalent_claims_match_and_share_a_bucket():
+    first = shingles("Officials said unemployment in the United Kingdom fell to 4.1 percent in March")
+    second = shingles("Unemployment in Britain fell to 4.1% in March, according to the statistics office")
+    unrelated = shingles("The city council approved a new budget for road repairs next year")
+    assert jaccard(first, second) >= 0.6
+    assert jaccard(first, unrelated) < 0.2
+
+    buckets = set(lsh_buckets(minhash_signature(first)))
+    assert buckets & set(lsh_buckets(minhash_signature(second)))
+    assert len(buckets) == NUM_BANDS
+
+def test_signatures_are_stable():
+    claim = shingles("Exports increased by 12% over the previous quarter")
+    assert minhash_signature(claim) == minhash_signature(set(claim))
+    assert lsh_buckets(minhash_signature(claim)) == lsh_buckets(minhash_signature(claim))
+
+def test_outlets_sharing_an_owner_group_together():
+    profiles = {"a.com": "owner", "b.com": "owner"}
+    assert outlet_group("a.com", profiles) == outlet_group("B.com", profiles)
+    assert outlet_group("c.com", profiles) != outlet_group("a.com", profiles)
+
+def test_wire_copies_count_once():
+    # One wire story carried by three outlets, linked by canonical article or identical body
+    articles = [("a.com", 1, "h1"), ("b.com", 1, "h1"), ("c.com", 7, "h1")]
+    assert corroboration_groups(articles, {}) == 1
+
+def test_independent_reports_count_separately():
+    articles = [("a.com", 1, "h1"), ("b.com", 2, "h2"), ("c.com", 3, None)]
+    assert corroboration_groups(articles, {}) == 3
+
+def test_outlets_sharing_an_owner_count_once():
+    profiles = {"a.com": "owner", "b.com": "owner"}
+    assert corroboration_groups([("a.com", 1, "h1"), ("B.com", 2, "h2")], profiles) == 1
+
+def test_wire_story_and_own_report_are_two_sources():
+    # a.com ran the wire copy and its own reporting; b.com only the wire copy
+    articles = [("a.com", 1, "h1"), ("b.com", 1, "h1"), ("a.com", 5, "h5")]
+    assert corroboration_groups(articles, {}) == 2
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Checks for claim extraction that need no database or spaCy model
+Run with: python -m pytest test_extractor.py
+"""
+import contextlib
+import functools
+import spacy
+import pytest
+import extractor
+from extractor import ClaimExtractor
+
+PARAGRAPHS = [
+    "Officials confirmed that unemployment fell to 4.1 percent in March, the lowest level in two years.",
+    "The mayor spoke at length about the new bridge and the traffic it is meant to relieve downtown.",
+    "According to the ministry, exports increased by 12% over the previous quarter as demand recovered.",
+    "Residents gathered in the square to watch the parade and the fireworks that followed it late at night.",
+    "Analysts expect the central bank to hold rates, and surveys found 60 percent of firms plan to hire.",
+    "The retailer took on 3 million seasonal workers across its warehouses during the winter.",
+    "Flooding along the coast caused 2 billion dollars of damage to homes and farmland last year.",
+]
+
+class FakeMatcher:
+    def __init__(self, engine):
+        pass
+
+@pytest.fixture
+def claim_extractor(monkeypatch):
+    """Extractor with a blank English pipeline (sentence splitting only) and no DB access"""
+    def blank_pipeline(name):
+        nlp = spacy.blank("en")
+        nlp.add_pipe("sentencizer")
+        return nlp
+    monkeypatch.setattr(extractor.spacy, "load", blank_pipeline)
+    monkeypatch.setattr(extractor, "create_engine", lambda url: None)
+    monkeypatch.setattr(extractor, "ClaimMatcher", FakeMatcher)
+    return ClaimExtractor(workers=1)
+
+def limit_chunks(monkeypatch, claim_extractor, max_chars):
+    chunks = functools.partial(ClaimExtractor.iter_text_chunks, claim_extractor, max_chars=max_chars)
+    monkeypatch.setattr(claim_extractor, "iter_text_chunks", chunks)
+
+def article_text(repeat=4):
+    return "\n\n".join(PARAGRAPHS * repeat)
+
+def test_chunks_reassemble_text(claim_extractor):
+    text = article_text()
+    for max_chars in (50, 120, 250, 1000, len(text) + 1):
+        chunks = list(claim_extractor.iter_text_chunks(text, max_chars))
+        assert "".join(chunks) == text
+        assert all(0 < len(chunk) <= max_chars for chunk in chunks)
+
+def test_chunks_end_at_paragraph_boundaries(claim_extractor):
+    text = article_text()
+    chunks = list(claim_extractor.iter_text_chunks(text, 250))
+    assert len(chunks) > 1
+    for chunk in chunks[:-1]:
+        assert chunk.endswith("\n\n")
+
+def test_long_paragraph_is_cut_between_words(claim_extractor):
+    paragraph = " ".join(PARAGRAPHS)  # one paragraph, several sentences
+    chunks = list(claim_extractor.iter_text_chunks(paragraph, 200))
+    assert "".join(chunks) == paragraph
+    assert any(chunk.endswith(". ") for chunk in chunks[:-1])
+    for chunk in chunks[:-1]:
+        assert chunk.endswith(" ")
+
+def test_short_text_is_one_chunk(claim_extractor):
+    assert list(claim_extractor.iter_text_chunks("Short text.", 100)) == ["Short text."]
+    assert list(claim_extractor.iter_text_chunks("", 100)) == []
+
+def test_chunked_extraction_matches_single_pass(claim_extractor, monkeypatch):
+    text = article_text()
+    whole = claim_extractor.extract_claims_from_text(text)
+    limit_chunks(monkeypatch, claim_extractor, 250)
+    chunked = claim_extractor.extract_claims_from_text(text)
+    assert whole
+    assert [claim["text"] for claim in chunked] == [claim["text"] for claim in whole]
+
+def test_claims_deduplicated_across_chunks(claim_extractor, monkeypatch):
+    limit_chunks(monkeypatch, claim_extractor, 120)
+    claims = claim_extractor.extract_claims_from_text(article_text(repeat=3))
+    keys = [claim["text"].lower()[:100] for claim in claims]
+    assert len(keys) == len(set(keys))
+
+def test_extraction_keeps_most_confident_claims(claim_extractor, monkeypatch):
+    monkeypatch.setattr(extractor, "MAX_CLAIMS", 2)
+    limit_chunks(monkeypatch, claim_extractor, 120)
+    claims = claim_extractor.extract_claims_from_text(article_text())
+    assert len(claims) == 2
+    assert all(claim["confidence"] == 0.9 for claim in claims)
+
+def test_content_hash_ignores_case_punctuation_and_spacing(claim_extractor):
+    text = article_text(repeat=1)
+    variant = text.upper().replace(",", "").replace("\n\n", "  \n ")
+    assert claim_extractor.content_hash(text) == claim_extractor.content_hash(variant)
+    assert claim_extractor.content_hash(text) != claim_extractor.content_hash(text + " More.")
+
+def test_memory_cache_is_bounded_lru(claim_extractor, monkeypatch):
+    monkeypatch.setattr(extractor, "CLAIM_CACHE_SIZE", 2)
+    claim_extractor.remember_claims("a", [])
+    claim_extractor.remember_claims("b", [])
+    assert claim_extractor.get_cached_claims("a") == []  # "a" becomes most recently used
+    claim_extractor.remember_claims("c", [])
+    assert list(claim_extractor.claim_cache) == ["a", "c"]
+
+class RecordingEngine:
+    """Engine stand-in that records statements and finds no rows"""
+    def __init__(self):
+        self.statements = []
+
+    @contextlib.contextmanager
+    def begin(self):
+        yield self
+
+    def execute(self, statement, params):
+        self.statements.append(" ".join(str(statement).split()))
+        return self
+
+    def first(self):
+        return None
+
+def test_shared_cache_lookup_does_not_write(claim_extractor):
+    claim_extractor.engine = RecordingEngine()
+    assert claim_extractor.get_cached_claims("missing") is None
+    assert claim_extractor.engine.statements == ["SELECT claims FROM claim_cache WHERE content_hash = :hash"]
+
+def test_merge_claims_orders_by_confidence_and_drops_duplicates(claim_extractor):
+    title = [{"text": "Exports rose to a record", "type": "fact", "confidence": 0.8}]
+    body = [
+        {"text": "3 million jobs were added", "type": "fact", "confidence": 0.9},
+        {"text": "EXPORTS ROSE TO A RECORD", "type": "fact", "confidence": 0.8},
+        {"text": "Prices fell to last year's level", "type": "fact", "confidence": 0.8},
+    ]
+    merged = claim_extractor.merge_claims(title, body)
+    assert [claim["text"] for claim in merged] == [
+        "3 million jobs were added", "Exports rose to a record", "Prices fell to last year's level"]
+
+def test_headline_claims_are_not_cached(claim_extractor, monkeypatch):
+    """Syndicated copies with different headlines share cached body claims only"""
+    cache, saved, hashes = {}, {}, {}
+
+    def save_claims(article_id, claims, outlet, timings, content_hash):
+        saved[article_id] = claims
+        hashes[article_id] = content_hash
+        return len(claims)
+
+    monkeypatch.setattr(claim_extractor, "get_cached_claims", cache.get)
+    monkeypatch.setattr(claim_extractor, "cache_claims", cache.__setitem__)
+    monkeypatch.setattr(claim_extractor, "save_claims", save_claims)
+
+    body = article_text(repeat=1)
+    first_title = "Officials confirmed exports increased by 12% in the first quarter"
+    second_title = "Surveys found 60 percent of firms now plan to hire more staff"
+    claim_extractor._process_article({"id": 1, "title": first_title, "text": body, "outlet": "a.com"},
+                                     extractor.new_timings())
+    claim_extractor._process_article({"id": 2, "title": second_title, "text": body, "outlet": "b.com"},
+                                     extractor.new_timings())
+
+    cached = [claim["text"] for claims in cache.values() for claim in claims]
+    assert len(cache) == 1
+    assert first_title not in cached and second_title not in cached
+    assert first_title in [claim["text"] for claim in saved[1]]
+    assert second_title in [claim["text"] for claim in saved[2]]
+    assert first_title not in [claim["text"] for claim in saved[2]]
+    # Both copies are stored with the body hash that verification groups wire copies by
+    assert hashes[1] == hashes[2] == claim_extractor.content_hash(body)
@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+Load test: publisher pages under concurrent requests
+Seeds a scratch Postgres database with synthetic articles, then drives
+index.py, events.py and events_optimized.py concurrently either as CGI
+processes (one interpreter per request, as lighttpd runs them) or through the
+persistent WSGI application, with the events page snapshot warm or cold.
+Reports p50/p95/p99 latency, time to first byte and throughput per page, and
+a per-stage profile (DB, grouping, EQIS, render) of the events pipeline.
+
+Usage: BENCH_DATABASE_URL=postgresql://... python3 bench_load.py [--seed] [runs...]
+       runs: cgi-uncached cgi-cached wsgi-uncached wsgi-cached profile (default: all)
+
+The database is reset by --seed; never point BENCH_DATABASE_URL at a live one.
+"""
+import os
+import sys
+import glob
+import math
+import time
+import random
+import shutil
+import tempfile
+import subprocess
+import multiprocessing
+from datetime import datetime, timedelta, timezone
+
+PUBLISHER_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+CGI_DIR = os.path.join(PUBLISHER_DIR, 'cgi-bin')
+DATABASE_DIR = os.path.join(PUBLISHER_DIR, '..', '..', 'database')
+sys.path.insert(0, CGI_DIR)
+sys.path.insert(0, PUBLISHER_DIR)
+
+DATABASE_URL = os.environ.get('BENCH_DATABASE_URL')
+ARTICLES = int(os.environ.get('BENCH_ARTICLES', '3000'))
+REQUESTS = int(os.environ.get('BENCH_REQUESTS', '40'))  # per page and run
+CONCURRENCY = int(os.environ.get('BENCH_CONCURRENCY', '4'))
+PROFILE_RUNS = int(os.environ.get('BENCH_PROFILE_RUNS', '5'))
+SCRIPTS = ('index.py', 'events.py', 'events_optimized.py')
+# The scripts render failures as HTML error pages with status 200
+ERROR_MARKER = b'Error</h1>'
+RUNS = ('cgi-uncached', 'cgi-cached', 'wsgi-uncached', 'wsgi-cached', 'profile')
+
+SEED = 42
+STORY_SIZE = 5
+OUTLETS = ['Reuters', 'Associated Press', 'BBC News', 'The Guardian', 'NPR',
+           'CNN', 'Bloomberg', 'Al Jazeera', 'Financial Times', 'Politico']
+BACKGROUND_WORDS = [f"word{i}" for i in range(3000)]
+
+# --- Synthetic data ---
+
+SYLLABLES = ['ka', 'lo', 'mi', 'ren', 'su', 'tav', 'no', 'bel', 'dor', 'vi', 'sa', 'gre', 'pol', 'tu', 'win', 'ze']
+
+def proper_name(n):
+    """Pronounceable capitalised word unique to n (entity extraction wants [A-Z][a-z]+)"""
+    syllables = []
+    while True:
+        n, digit = divmod(n, len(SYLLABLES))
+        syllables.append(SYLLABLES[digit])
+        if n == 0:
+            break
+    return ''.join(syllables).capitalize() + 'an'
+
+def make_story(story):
+    """Shared title terms and named entities for one synthetic story"""
+    return {
+        'entities': [f"{proper_name(story * 8 + j)} {proper_name(story * 8 + j + 4)}" for j in range(4)],
+        'place': f"{proper_name(story * 8 + 7)} City",
+        'headline': [f"topic{story}term{j}" for j in range(4)],
+        'terms': [f"topic{story}term{j}" for j in range(12)],
+    }
+
+def make_article(story_id, story, rng, now):
+    """(url, outlet, title, published_at, text, quality_score, computed_event_id)"""
+    title = f"{rng.choice(story['entities'])} {' '.join(story['headline'])} {rng.choice(story['terms'])} in {story['place']}"
+    sentences = []
+    for entity in story['entities'] * 3:
+        words = [rng.choice(story['terms']) if rng.random() < 0.3 else rng.choice(BACKGROUND_WORDS)
+                 for _ in range(20)]
+        sentences.append(f"{entity} said {' '.join(words)} in {story['place']}.")
+    rng.shuffle(sentences)
+    outlet = rng.choice(OUTLETS)
+    # Stories break within a few hours; the window spreads them over three days
+    published_at = now - timedelta(minutes=(story_id * 37) % (68 * 60) + rng.randrange(0, 180))
+    url = f"https://bench.example/{story_id}/{rng.getrandbits(64):x}"
+    return (url, outlet, title, published_at, ' '.join(sentences), round(rng.uniform(40, 95), 2), story_id)
+
+def apply_schema(conn):
+    """Create the schema and migrations on an empty database"""
+    cur = conn.cursor()
+    cur.execute("SELECT to_regclass('public.articles')")
+    if cur.fetchone()[0] is not None:
+        return
+    paths = [os.path.join(DATABASE_DIR, 'schema.sql')]
+    paths += sorted(glob.glob(os.path.join(DATABASE_DIR, 'migrations', '*.sql')))
+    for path in paths:
+        with open(path) as f:
+            cur.execute(f.read())
+    conn.commit()
+    print(f"Applied {len(paths)} schema files")
+
+def seed_database(n):
+    import psycopg2
+    from psycopg2.extras import execute_values
+
+    rng = random.Random(SEED)
+    now = datetime.now(timezone.utc)
+    conn = psycopg2.connect(DATABASE_URL)
+    apply_schema(conn)
+    cur = conn.cursor()
+
+    cur.execute("TRUNCATE articles, events RESTART IDENTITY CASCADE")
+    stories = max(n // STORY_SIZE, 1)
+    execute_values(cur, "INSERT INTO events (id, title) VALUES %s",
+                   [(story_id, f"Story {story_id}") for story_id in range(1, stories + 1)])
+    cur.execute("SELECT setval('events_id_seq', %s)", (stories,))
+
+    story_data = {story_id: make_story(story_id) for story_id in range(1, stories + 1)}
+    rows = [make_article(story_id, story_data[story_id], rng, now)
+            for story_id in (i % stories + 1 for i in range(n))]
+    execute_values(cur, """
+        INSERT INTO articles (url, outlet, title, published_at, text, quality_score, computed_event_id)
+        VALUES %s
+    """, rows, page_size=1000)
+    conn.commit()
+    cur.execute("ANALYZE articles")
+    conn.commit()
+    conn.close()
+    print(f"Seeded {n} articles in {stories} stories")
+
+# --- Request drivers (run in worker processes) ---
+
+_mode = None
+_cache_dir = None
+_private_cache = False
+_application = None
+
+def init_worker(mode, cache_dir, run_dir):
+    """Per-worker setup; a private, emptied cache dir makes every events.py view cold"""
+    global _mode, _cache_dir, _private_cache, _application
+    _mode = mode
+    _private_cache = cache_dir is None
+    _cache_dir = cache_dir or tempfile.mkdtemp(dir=run_dir)
+    os.environ['DATABASE_URL'] = DATABASE_URL
+    os.environ['PAGE_CACHE_DIR'] = _cache_dir
+    if mode == 'wsgi':
+        # Imports, pooled connections and in-process caches live as long as the worker,
+        # like a gunicorn worker process
+        import wsgi
+        _application = wsgi.application
+
+def clear_private_cache():
+    if _private_cache:
+        for path in glob.glob(os.path.join(_cache_dir, '*')):
+            os.remove(path)
+
+def cgi_status(head):
+    for line in head.splitlines():
+        name, _, value = line.partition(b':')
+        if name.strip().lower() == b'status':
+            return int(value.split()[0])
+    return 200
+
+def request_cgi(script):
+    env = {
+        'PATH': os.environ.get('PATH', ''),
+        'GATEWAY_INTERFACE': 'CGI/1.1',
+        'REQUEST_METHOD': 'GET',
+        'QUERY_STRING': '',
+        'SCRIPT_NAME': f'/cgi-bin/{script}',
+        'SERVER_PROTOCOL': 'HTTP/1.1',
+        'DATABASE_URL': DATABASE_URL,
+        'PAGE_CACHE_DIR': _cache_dir,
+    }
+    start = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, os.path.join(CGI_DIR, script)], env=env,
+                            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    first = proc.stdout.read1(65536)
+    ttfb = time.perf_counter() - start
+    output = first + proc.stdout.read()
+    proc.wait()
+    latency = time.perf_counter() - start
+
+    head = output.replace(b'\r\n', b'\n').split(b'\n\n', 1)[0]
+    ok = proc.returncode == 0 and cgi_status(head) < 400 and ERROR_MARKER not in output
+    return latency, ttfb, ok, len(output)
+
+def request_wsgi(script):
+    environ = {
+        'REQUEST_METHOD': 'GET',
+        'PATH_INFO': f'/cgi-bin/{script}',
+        'QUERY_STRING': '',
+        'SERVER_NAME': 'localhost',
+        'SERVER_PORT': '8000',
+        'SERVER_PROTOCOL': 'HTTP/1.1',
+        'REMOTE_ADDR': '127.0.0.1',
+    }
+    status = []
+
+    def start_response(response_status, headers, exc_info=None):
+        status.append(int(response_status.split()[0]))
+
+    start = time.perf_counter()
+    body = _application(environ, start_response)
+    ttfb = None
+    size = 0
+    failed = False
+    try:
+        for chunk in body:
+            if ttfb is None and chunk:
+                ttfb = time.perf_counter() - start
+            size += len(chunk)
+            failed = failed or ERROR_MARKER in chunk
+    finally:
+        if hasattr(body, 'close'):
+            body.close()
+    latency = time.perf_counter() - start
+    return latency, ttfb if ttfb is not None else latency, bool(status) and status[0] < 400 and not failed, size
+
+def run_request(script):
+    if script == 'events.py':
+        clear_private_cache()
+    if _mode == 'wsgi':
+        result = request_wsgi(script)
+    else:
+        result = request_cgi(script)
+    return (script,) + result
+
+# --- Reporting ---
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a non-empty list"""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+def report(label, results, wall_seconds):
+    print(f"{label}: {len(results)} requests, concurrency {CONCURRENCY}, "
+          f"{len(results) / wall_seconds:.1f} req/s overall")
+    print(f"  {'page':<22}{'ok':>5}{'err':>5}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'ttfb p50':>10}{'KiB':>8}")
+    for script in SCRIPTS:
+        rows = [r for r in results if r[0] == script]
+        if not rows:
+            continue
+        latencies = [r[1] * 1000 for r in rows]
+        ttfbs = [r[2] * 1000 for r in rows]
+        errors = sum(1 for r in rows if not r[3])
+        print(f"  {script:<22}{len(rows) - errors:>5}{errors:>5}"
+              f"{percentile(latencies, 50):>10.1f}{percentile(latencies, 95):>10.1f}{percentile(latencies, 99):>10.1f}"
+              f"{percentile(ttfbs, 50):>10.1f}{sum(r[4] for r in rows) / len(rows) / 1024:>8.1f}")
+
+# --- Runs ---
+
+def warm_snapshot(cache_dir):
+    env = dict(os.environ, DATABASE_URL=DATABASE_URL, PAGE_CACHE_DIR=cache_dir)
+    subprocess.run([sys.executable, os.path.join(CGI_DIR, 'events.py'), '--refresh-snapshot'],
+                   env=env, check=True)
+
+def load_run(name):
+    mode, cache = name.split('-')
+    run_dir = tempfile.mkdtemp(prefix='bench-cache-')
+    shared_dir = None
+    if cache == 'cached':
+        shared_dir = os.path.join(run_dir, 'shared')
+        warm_snapshot(shared_dir)
+
+    tasks = [script for script in SCRIPTS for _ in range(REQUESTS)]
+    random.Random(SEED).shuffle(tasks)
+
+    try:
+        with multiprocessing.Pool(CONCURRENCY, initializer=init_worker, initargs=(mode, shared_dir, run_dir)) as pool:
+            start = time.perf_counter()
+            results = list(pool.imap_unordered(run_request, tasks))
+            wall_seconds = time.perf_counter() - start
+    finally:
+        shutil.rmtree(run_dir, ignore_errors=True)
+
+    report(name, results, wall_seconds)
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+def profile_run():
+    """Per-stage timing of the events.py pipeline, in-process"""
+    os.environ['DATABASE_URL'] = DATABASE_URL
+    import events
+
+    stages = {'db': [], 'grouping': [], 'eqis': [], 'render': []}
+    for _ in range(PROFILE_RUNS):
+        # The article feature cache persists in a long-lived process; these are warm runs after the first
+        articles, seconds = timed(events.fetch_recent_articles)
+        stages['db'].append(seconds)
+        event_list, seconds = timed(events.group_articles_into_events, articles)
+        stages['grouping'].append(seconds)
+        scored, seconds = timed(events.score_events, articles, event_list)
+        stages['eqis'].append(seconds)
+        _, seconds = timed(lambda: events.render_events_page(events.build_events_data(
+            articles, [events.build_event_record(*scored_event) for scored_event in scored])))
+        stages['render'].append(seconds)
+
+    print(f"profile: events.py pipeline, {len(articles)} articles -> {len(event_list)} events, {PROFILE_RUNS} runs")
+    print(f"  {'stage':<12}{'first ms':>10}{'p50 ms':>10}{'max ms':>10}")
+    for stage, seconds in stages.items():
+        ms = [s * 1000 for s in seconds]
+        print(f"  {stage:<12}{ms[0]:>10.1f}{percentile(ms, 50):>10.1f}{max(ms):>10.1f}")
+
+def main():
+    if not DATABASE_URL:
+        sys.exit("Set BENCH_DATABASE_URL to a scratch database")
+
+    args = sys.argv[1:]
+    if '--seed' in args:
+        args.remove('--seed')
+        seed_database(ARTICLES)
+
+    runs = args or list(RUNS)
+    unknown = [run for run in runs if run not in RUNS]
+    if unknown:
+        sys.exit(f"Unknown runs: {', '.join(unknown)} (choose from {', '.join(RUNS)})")
+
+    for run in runs:
+        if run == 'profile':
+            profile_run()
+        else:
+            load_run(run)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-pair TF-IDF fits vs. the shared SimilarityEngine
+Uses a synthetic corpus of topical articles so it runs without a database.
+
+Usage: python3 bench_similarity.py [sizes...]   (default: 300 3000 30000)
+"""
+import os
+import sys
+import time
+import random
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'cgi-bin'))
+
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics.pairwise import cosine_similarity
+from similarity import SimilarityEngine
+
+SEED = 42
+WORDS_PER_ARTICLE = 300
+BASELINE_SAMPLE_PAIRS = 200
+EVENT_SIZE = 5
+TOP_K = 10
+
+def make_corpus(n, rng):
+    """Articles drawn from per-story vocabularies mixed with a shared background"""
+    background = [f"word{i}" for i in range(5000)]
+    stories = max(n // EVENT_SIZE, 1)
+    documents = []
+    for i in range(n):
+        story = i % stories
+        topical = [f"story{story}term{j}" for j in range(40)]
+        words = [rng.choice(topical) if rng.random() < 0.3 else rng.choice(background)
+                 for _ in range(WORDS_PER_ARTICLE)]
+        documents.append(' '.join(words))
+    return documents
+
+def pair_similarity(text1, text2):
+    """Legacy approach: fit a fresh vectorizer on two documents"""
+    vectorizer = TfidfVectorizer(max_features=1000, stop_words='english', ngram_range=(1, 2), min_df=1)
+    matrix = vectorizer.fit_transform([text1, text2])
+    return cosine_similarity(matrix[0:1], matrix[1:2])[0][0]
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+def bench(n):
+    rng = random.Random(SEED)
+    documents = make_corpus(n, rng)
+    all_pairs = n * (n - 1) // 2
+
+    # Per-pair baseline is measured on a sample and extrapolated to all pairs
+    sample = [(rng.randrange(n), rng.randrange(n)) for _ in range(BASELINE_SAMPLE_PAIRS)]
+    _, sample_seconds = timed(lambda: [pair_similarity(documents[i], documents[j]) for i, j in sample])
+    per_pair = sample_seconds / len(sample)
+
+    engine, fit_seconds = timed(lambda: SimilarityEngine(documents))
+    _, pairwise_seconds = timed(lambda: [engine.pairwise(i, j) for i, j in sample])
+    groups = [list(range(start, min(start + EVENT_SIZE, n))) for start in range(0, n, EVENT_SIZE)]
+    _, groups_seconds = timed(lambda: [engine.mean_pairwise(group) for group in groups])
+    _, topk_seconds = timed(lambda: engine.top_k_all(k=TOP_K))
+
+    print(f"n={n:>6}  vocab={engine.matrix.shape[1]:>6}  nnz={engine.matrix.nnz:>9}")
+    print(f"  per-pair fit           {per_pair * 1000:8.2f} ms/pair -> all {all_pairs} pairs ~{per_pair * all_pairs:10.1f} s (extrapolated)")
+    print(f"  engine fit             {fit_seconds:8.3f} s")
+    print(f"  engine pairwise        {pairwise_seconds / len(sample) * 1e6:8.1f} us/pair")
+    print(f"  engine event coherence {groups_seconds:8.3f} s for {len(groups)} events of {EVENT_SIZE}")
+    print(f"  engine top-{TOP_K} all      {topk_seconds:8.3f} s (all {all_pairs} pairs scored)")
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [300, 3000, 30000]
+    for n in sizes:
+        bench(n)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Events JSON API
+Serves the precomputed event snapshot written by events.py with cursor
+pagination, field selection, gzip and ETag / If-None-Match support.
+
+GET /api/events?limit=20&cursor=<next_cursor>&fields=title,eqis_score,articles
+"""
+import os
+import json
+import base64
+import hashlib
+from bisect import bisect_right
+from urllib.parse import parse_qs
+import page_cache
+
+DATA_SNAPSHOT_NAME = 'events.json'
+EVENTS_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'events.py')
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+EVENT_FIELDS = ('id', 'eqis_score', 'title', 'url', 'outlet', 'summary',
+                'coverage_outlets', 'latest', 'articles')
+
+class BadRequest(Exception):
+    pass
+
+def send_json(status, payload):
+    print(f"Status: {status}")
+    print("Content-Type: application/json\n")
+    print(json.dumps(payload))
+
+def encode_cursor(event):
+    raw = json.dumps([event['eqis_score'], event['id']]).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+def decode_cursor(cursor):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        eqis_score, event_id = json.loads(raw)
+        return (-float(eqis_score), int(event_id))
+    except (ValueError, TypeError):
+        raise BadRequest('Invalid cursor')
+
+def parse_query(query_string):
+    """Validated (limit, cursor key, fields) from the query string"""
+    params = parse_qs(query_string)
+
+    try:
+        limit = int(params.get('limit', [DEFAULT_LIMIT])[0])
+    except ValueError:
+        raise BadRequest('limit must be an integer')
+    if not 1 <= limit <= MAX_LIMIT:
+        raise BadRequest(f'limit must be between 1 and {MAX_LIMIT}')
+
+    cursor = params.get('cursor', [None])[0]
+    after = decode_cursor(cursor) if cursor else None
+
+    fields = None
+    if 'fields' in params:
+        fields = [field.strip() for field in params['fields'][0].split(',') if field.strip()]
+        unknown = [field for field in fields if field not in EVENT_FIELDS]
+        if unknown:
+            raise BadRequest(f"Unknown fields: {', '.join(unknown)}")
+        if 'id' not in fields:
+            fields.insert(0, 'id')
+
+    return limit, after, fields
+
+def sort_keys(snapshot):
+    """Keyset ordering of the snapshot's events (score descending, then id), built once"""
+    if 'sort_keys' not in snapshot:
+        events = page_cache.snapshot_json(snapshot)['events']
+        snapshot['sort_keys'] = [(-event['eqis_score'], event['id']) for event in events]
+    return snapshot['sort_keys']
+
+def build_page(snapshot, limit, after, fields):
+    data = page_cache.snapshot_json(snapshot)
+    events = data['events']
+
+    start = bisect_right(sort_keys(snapshot), after) if after else 0
+    page = events[start:start + limit]
+    if fields:
+        page = [{field: event[field] for field in fields} for event in page]
+
+    has_more = start + limit < len(events)
+    return {
+        'generated_at': data['generated_at'],
+        'coverage_hours': data['coverage_hours'],
+        'source_articles': data['source_articles'],
+        'event_count': data['event_count'],
+        'events': page,
+        'next_cursor': encode_cursor(events[start + limit - 1]) if has_more else None,
+    }
+
+def response_etag(snapshot, limit, after, fields):
+    """The response only depends on the snapshot version and the normalised query"""
+    variant = json.dumps([snapshot['etag'], limit, after, fields])
+    return '"' + hashlib.sha1(variant.encode('utf-8')).hexdigest()[:20] + '"'
+
+def load_snapshot():
+    """Current event data snapshot, computing it on a cold cache"""
+    snapshot = page_cache.read_snapshot(DATA_SNAPSHOT_NAME)
+    if snapshot is None:
+        import events
+        # Builds the snapshots, or waits for the process already building them
+        events.refresh_snapshot(wait=True)
+        snapshot = page_cache.read_snapshot(DATA_SNAPSHOT_NAME)
+    elif page_cache.is_stale(snapshot):
+        # Stale-while-revalidate, same refresh as the HTML page
+        page_cache.trigger_refresh(EVENTS_SCRIPT, 'events.html')
+    return snapshot
+
+def main():
+    try:
+        limit, after, fields = parse_query(os.environ.get('QUERY_STRING', ''))
+    except BadRequest as e:
+        send_json('400 Bad Request', {'error': str(e)})
+        return
+
+    try:
+        snapshot = load_snapshot()
+        if snapshot is None:
+            raise Exception('Event data is not available yet')
+    except Exception as e:
+        send_json('503 Service Unavailable', {'error': str(e)})
+        return
+
+    response = {'mtime': snapshot['mtime'], 'etag': response_etag(snapshot, limit, after, fields), 'body': b''}
+
+    if not page_cache.not_modified(response):
+        body = json.dumps(build_page(snapshot, limit, after, fields), separators=(',', ':'))
+        response['body'] = body.encode('utf-8')
+    page_cache.send_snapshot(response, 'application/json')
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as e:
+        send_json('500 Internal Server Error', {'error': str(e)})
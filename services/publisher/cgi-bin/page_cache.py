@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Materialized page snapshots for publisher scripts
+Rendered pages are stored as files under htdocs and served with ETag /
+Last-Modified validators. Stale snapshots keep being served while a single
+background refresh regenerates them (stale-while-revalidate); a Postgres
+advisory lock decides which process refreshes. Snapshot files are local to
+each pod, so the lock is per pod: it serialises the pod's workers and its
+refresh loop, while every pod keeps its own snapshots fresh.
+"""
+import os
+import sys
+import gzip
+import json
+import zlib
+import socket
+import subprocess
+import contextlib
+from datetime import datetime, timezone
+from email.utils import formatdate, parsedate_to_datetime
+from db import db_connection
+
+CACHE_DIR = os.environ.get('PAGE_CACHE_DIR', '/var/www/htdocs/cache')
+SNAPSHOT_TTL = int(os.environ.get('PAGE_CACHE_TTL', '120'))  # seconds a snapshot counts as fresh
+STALE_WHILE_REVALIDATE = int(os.environ.get('PAGE_CACHE_SWR', '600'))
+GZIP_MIN_BYTES = 1024
+REFRESH_LOCK_CLASS = 0x70616765  # advisory lock namespace ('page') for snapshot refreshes
+
+# Snapshots already read by this process, reused while the file is unchanged
+_loaded = {}
+
+def snapshot_path(name):
+    return os.path.join(CACHE_DIR, name)
+
+def make_snapshot(body, mtime):
+    """Snapshot dict with validators derived from modification time and size"""
+    return {
+        'body': body,
+        'mtime': mtime,
+        'etag': f'"{int(mtime * 1000):x}-{len(body):x}"',
+    }
+
+def read_snapshot(name):
+    """Load a stored snapshot, or None if it has not been rendered yet"""
+    path = snapshot_path(name)
+    try:
+        stat = os.stat(path)
+        cached = _loaded.get(path)
+        if cached and cached[0] == (stat.st_mtime_ns, stat.st_size):
+            return cached[1]
+        with open(path, 'rb') as f:
+            body = f.read()
+            stat = os.fstat(f.fileno())
+    except OSError:
+        return None
+    snapshot = make_snapshot(body, stat.st_mtime)
+    _loaded[path] = ((stat.st_mtime_ns, stat.st_size), snapshot)
+    return snapshot
+
+def snapshot_json(snapshot):
+    """Parsed JSON body of a snapshot, decoded once per snapshot"""
+    if 'json' not in snapshot:
+        snapshot['json'] = json.loads(snapshot['body'])
+    return snapshot['json']
+
+def write_snapshot(name, body):
+    """Atomically replace a snapshot; still returns it when the cache dir is not writable"""
+    if isinstance(body, str):
+        body = body.encode('utf-8')
+    path = snapshot_path(name)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(tmp_path, 'wb') as f:
+            f.write(body)
+        os.replace(tmp_path, path)
+        return make_snapshot(body, os.stat(path).st_mtime)
+    except OSError as e:
+        print(f"Could not store page snapshot {name}: {str(e)}", file=sys.stderr)
+        return make_snapshot(body, datetime.now(timezone.utc).timestamp())
+
+def snapshot_age(snapshot):
+    return datetime.now(timezone.utc).timestamp() - snapshot['mtime']
+
+def is_stale(snapshot):
+    return snapshot_age(snapshot) > SNAPSHOT_TTL
+
+def refresh_lock_key(name, host=None):
+    """(namespace, key) pair of the advisory lock guarding a snapshot's refresh on this pod"""
+    host = host or socket.gethostname()
+    key = zlib.crc32(f"{host}/{name}".encode('utf-8'))
+    return REFRESH_LOCK_CLASS, key - (1 << 32) if key >= (1 << 31) else key
+
+@contextlib.contextmanager
+def refresh_lock(name, wait=False):
+    """Per-snapshot, per-pod refresh lock held until the block exits; the only gate on who rebuilds
+
+    Without wait, yields False at once if another process on this pod holds
+    it; with wait, blocks until that refresh has finished.
+    """
+    key = refresh_lock_key(name)
+    with db_connection() as conn:
+        cur = conn.cursor()
+        if wait:
+            cur.execute("SELECT pg_advisory_lock(%s, %s)", key)
+            acquired = True
+        else:
+            cur.execute("SELECT pg_try_advisory_lock(%s, %s)", key)
+            acquired = cur.fetchone()[0]
+        # Session lock: commit so the lock connection does not sit idle in a transaction during the rebuild
+        conn.commit()
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                cur.execute("SELECT pg_advisory_unlock(%s, %s)", key)
+                conn.commit()
+
+def refresh_running(name):
+    """Whether a refresh on this pod holds the lock (a hint to avoid spawning refreshes, not a gate)"""
+    namespace, key = refresh_lock_key(name)
+    try:
+        with db_connection() as conn:
+            cur = conn.cursor()
+            cur.execute("""
+                SELECT EXISTS (
+                    SELECT 1 FROM pg_locks
+                    WHERE locktype = 'advisory' AND classid = %s::int8::oid
+                      AND objid = %s::int8::oid AND objsubid = 2 AND granted
+                )
+            """, (namespace, key & 0xffffffff))
+            return cur.fetchone()[0]
+    except Exception:
+        return False
+
+def trigger_refresh(script_path, name):
+    """Start a detached `script --refresh-snapshot` unless one is already running
+
+    Two requests may still both start one; the refresh takes refresh_lock and
+    the loser exits without rebuilding.
+    """
+    if refresh_running(name):
+        return False
+    try:
+        subprocess.Popen(
+            [sys.executable, script_path, '--refresh-snapshot'],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+        return True
+    except OSError as e:
+        print(f"Could not start snapshot refresh: {str(e)}", file=sys.stderr)
+        return False
+
+def accepts_gzip():
+    return 'gzip' in os.environ.get('HTTP_ACCEPT_ENCODING', '').lower()
+
+def gzip_body(snapshot):
+    """Compressed body, computed once per snapshot"""
+    if 'gzip' not in snapshot:
+        snapshot['gzip'] = gzip.compress(snapshot['body'], compresslevel=6, mtime=0)
+    return snapshot['gzip']
+
+def gzip_etag(etag):
+    return etag[:-1] + '-gzip"'
+
+def not_modified(snapshot):
+    """Evaluate If-None-Match / If-Modified-Since from the CGI environment"""
+    if_none_match = os.environ.get('HTTP_IF_NONE_MATCH')
+    if if_none_match:
+        tags = [tag.strip() for tag in if_none_match.split(',')]
+        tags = [tag[2:] if tag.startswith('W/') else tag for tag in tags]
+        return snapshot['etag'] in tags or gzip_etag(snapshot['etag']) in tags or '*' in tags
+
+    if_modified_since = os.environ.get('HTTP_IF_MODIFIED_SINCE')
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+        return int(snapshot['mtime']) <= since
+    return False
+
+def send_snapshot(snapshot, content_type, extra_headers=()):
+    """Write CGI headers and body for a snapshot, honouring conditional requests and gzip"""
+    body = snapshot['body']
+    etag = snapshot['etag']
+    encoding_headers = [('Vary', 'Accept-Encoding')]
+    if accepts_gzip() and len(body) >= GZIP_MIN_BYTES:
+        body = gzip_body(snapshot)
+        etag = gzip_etag(etag)
+        encoding_headers.append(('Content-Encoding', 'gzip'))
+
+    headers = [
+        ('ETag', etag),
+        ('Last-Modified', formatdate(snapshot['mtime'], usegmt=True)),
+        ('Cache-Control', f"public, max-age={SNAPSHOT_TTL}, stale-while-revalidate={STALE_WHILE_REVALIDATE}"),
+        ('Age', str(max(0, int(snapshot_age(snapshot))))),
+    ]
+    headers.extend(extra_headers)
+
+    if not_modified(snapshot):
+        print("Status: 304 Not Modified")
+        for name, value in headers + encoding_headers[:1]:
+            print(f"{name}: {value}")
+        print()
+        return
+
+    print(f"Content-Type: {content_type}")
+    for name, value in headers + encoding_headers:
+        print(f"{name}: {value}")
+    print(f"Content-Length: {len(body)}")
+    print()
+    sys.stdout.flush()
+    sys.stdout.buffer.write(body)
+    sys.stdout.buffer.flush()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Vectorized article similarity for publisher scripts
+One TF-IDF fit over the whole candidate window; similarities are dot products
+of rows in the L2-normalized sparse matrix.
+"""
+import numpy as np
+from scipy.sparse import csr_matrix
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+MIN_DOCUMENT_CHARS = 50  # shorter (cleaned) documents never count as similar
+BLOCK_ROWS = 512  # rows per sparse product in all-pairs queries
+
+class SimilarityEngine:
+    def __init__(self, documents, keys=None, max_features=20000, ngram_range=(1, 2)):
+        """Fit once over documents; keys (e.g. article ids) map back to rows"""
+        self.keys = list(keys) if keys is not None else list(range(len(documents)))
+        self.index = {key: row for row, key in enumerate(self.keys)}
+
+        usable = [doc if doc and len(doc) >= MIN_DOCUMENT_CHARS else '' for doc in documents]
+        vectorizer = TfidfVectorizer(
+            max_features=max_features,
+            stop_words='english',
+            ngram_range=ngram_range,
+            min_df=1,
+            sublinear_tf=True,
+            dtype=np.float32,
+        )
+        try:
+            self.matrix = vectorizer.fit_transform(usable).tocsr()
+        except ValueError:
+            # Empty vocabulary: every document is too short or only stop words
+            self.matrix = csr_matrix((len(usable), 1), dtype=np.float32)
+        self.vectorizer = vectorizer
+
+    def __contains__(self, key):
+        return key in self.index
+
+    def rows(self, keys):
+        return [self.index[key] for key in keys]
+
+    def pairwise(self, key1, key2):
+        """Cosine similarity of two documents"""
+        row1, row2 = self.index[key1], self.index[key2]
+        return float(self.matrix[row1].multiply(self.matrix[row2]).sum())
+
+    def similarity_matrix(self, keys):
+        """Dense cosine similarity matrix for a small group of documents"""
+        sub = self.matrix[self.rows(keys)]
+        return (sub @ sub.T).toarray()
+
+    def mean_pairwise(self, keys):
+        """Average similarity over all distinct pairs in a group (None for fewer than two)"""
+        n = len(keys)
+        if n < 2:
+            return None
+        sims = self.similarity_matrix(keys)
+        upper = sims[np.triu_indices(n, k=1)]
+        return float(upper.mean())
+
+    def top_k(self, key, k=10, min_similarity=0.0):
+        """Most similar other documents as [(key, similarity)], best first"""
+        row = self.index[key]
+        scores = (self.matrix @ self.matrix[row].T).toarray().ravel()
+        scores[row] = -1.0
+        return self._select(scores, k, min_similarity)
+
+    def top_k_all(self, k=10, min_similarity=0.0):
+        """Top-k neighbours of every document, computed in sparse row blocks"""
+        neighbours = {}
+        matrix_t = self.matrix.T.tocsc()
+        for start in range(0, self.matrix.shape[0], BLOCK_ROWS):
+            block = (self.matrix[start:start + BLOCK_ROWS] @ matrix_t).tocsr()
+            for offset in range(block.shape[0]):
+                row = start + offset
+                lo, hi = block.indptr[offset], block.indptr[offset + 1]
+                cols, data = block.indices[lo:hi], block.data[lo:hi]
+                keep = (cols != row) & (data >= min_similarity)
+                cols, data = cols[keep], data[keep]
+                if len(data) > k:
+                    part = np.argpartition(-data, k)[:k]
+                    cols, data = cols[part], data[part]
+                order = np.argsort(-data)
+                neighbours[self.keys[row]] = [(self.keys[c], float(d)) for c, d in zip(cols[order], data[order])]
+        return neighbours
+
+    def _select(self, scores, k, min_similarity):
+        if k < len(scores):
+            candidates = np.argpartition(-scores, k)[:k]
+        else:
+            candidates = np.arange(len(scores))
+        candidates = candidates[np.argsort(-scores[candidates])]
+        return [(self.keys[row], float(scores[row])) for row in candidates if scores[row] >= max(min_similarity, 0.0)]
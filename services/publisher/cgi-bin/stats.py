@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Cheap header counters for publisher pages
+Row counts come from the trigger-maintained engine_stats table plus its pending
+engine_stats_deltas rows, falling back to the planner's pg_class.reltuples
+estimate, so no page runs COUNT(*) scans.
+
+Run with --compact to fold the pending deltas into engine_stats; start.sh does
+this from the publisher refresh loop so the deltas table stays small.
+"""
+import os
+import sys
+import time
+import psycopg2
+from db import db_connection
+
+STATS_TTL = int(os.environ.get('STATS_TTL', '30'))  # seconds counts are reused in-process
+COUNTED_TABLES = ('articles', 'events')
+
+STATS_QUERY = """
+    SELECT c.relname, COALESCE(s.value + COALESCE(d.delta, 0), GREATEST(c.reltuples, 0)::BIGINT)
+    FROM pg_class c
+    LEFT JOIN engine_stats s ON s.name = c.relname
+    LEFT JOIN (
+        SELECT name, SUM(delta) AS delta FROM engine_stats_deltas GROUP BY name
+    ) d ON d.name = c.relname
+    WHERE c.relname = ANY(%s) AND c.relkind = 'r' AND c.relnamespace = 'public'::regnamespace
+"""
+
+# Used until the engine_stats migration has been applied
+ESTIMATE_QUERY = """
+    SELECT c.relname, GREATEST(c.reltuples, 0)::BIGINT
+    FROM pg_class c
+    WHERE c.relname = ANY(%s) AND c.relkind = 'r' AND c.relnamespace = 'public'::regnamespace
+"""
+
+_cached = None
+_cached_at = 0.0
+
+def get_counts(cur):
+    """Row counts of the counted tables as a dict, e.g. {'articles': 1234, 'events': 56}"""
+    global _cached, _cached_at
+    if _cached is not None and time.time() - _cached_at < STATS_TTL:
+        return dict(_cached)
+
+    try:
+        cur.execute(STATS_QUERY, (list(COUNTED_TABLES),))
+    except psycopg2.errors.UndefinedTable:
+        cur.connection.rollback()
+        cur.execute(ESTIMATE_QUERY, (list(COUNTED_TABLES),))
+    counts = dict(cur.fetchall())
+
+    _cached = {table: int(counts.get(table, 0)) for table in COUNTED_TABLES}
+    _cached_at = time.time()
+    return dict(_cached)
+
+def compact(conn):
+    """Fold pending engine_stats_deltas rows into engine_stats (safe to run from every replica)"""
+    with conn.cursor() as cur:
+        try:
+            cur.execute("SELECT engine_stats_compact()")
+        except psycopg2.errors.UndefinedFunction:
+            # engine_stats migration not applied yet
+            conn.rollback()
+            return
+    conn.commit()
+
+if __name__ == "__main__":
+    if '--compact' in sys.argv[1:]:
+        with db_connection() as conn:
+            compact(conn)
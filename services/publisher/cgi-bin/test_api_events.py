@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Checks for the events JSON API: keyset cursors, pages and ETags (no database needed)
+Run with: python -m pytest test_api_events.py
+"""
+import json
+import pytest
+import page_cache
+from api_events import (BadRequest, encode_cursor, decode_cursor, parse_query, build_page,
+                        response_etag)
+
+def make_snapshot(scores, mtime=1700000000.0):
+    events = [{'id': i + 1, 'eqis_score': score, 'title': f"Event {i + 1}", 'url': f"https://example.com/{i + 1}",
+               'outlet': 'example.com', 'summary': '', 'coverage_outlets': 1, 'latest': None, 'articles': []}
+              for i, score in enumerate(scores)]
+    events.sort(key=lambda event: (-event['eqis_score'], event['id']))
+    body = json.dumps({'generated_at': 'now', 'coverage_hours': 72, 'source_articles': 10,
+                       'event_count': len(events), 'events': events}).encode('utf-8')
+    return page_cache.make_snapshot(body, mtime)
+
+def walk(snapshot, limit):
+    """Every page of the snapshot following next_cursor"""
+    pages, after = [], None
+    while True:
+        page = build_page(snapshot, limit, after, None)
+        pages.append(page)
+        if page['next_cursor'] is None:
+            return pages
+        after = decode_cursor(page['next_cursor'])
+
+def test_cursor_round_trip():
+    event = {'id': 42, 'eqis_score': 87.5}
+    assert decode_cursor(encode_cursor(event)) == (-87.5, 42)
+    assert '=' not in encode_cursor(event)
+
+def test_invalid_cursor_is_a_bad_request():
+    for cursor in ('not-a-cursor', encode_cursor({'id': 'x', 'eqis_score': 1})):
+        with pytest.raises(BadRequest):
+            decode_cursor(cursor)
+
+def test_pages_cover_every_event_once_with_tied_scores():
+    snapshot = make_snapshot([90, 80, 80, 80, 75, 60, 60, 50, 40, 40, 40])
+    events = page_cache.snapshot_json(snapshot)['events']
+    for limit in (1, 2, 3, 4, 11, 20):
+        pages = walk(snapshot, limit)
+        seen = [event['id'] for page in pages for event in page['events']]
+        assert seen == [event['id'] for event in events]
+        assert all(len(page['events']) <= limit for page in pages)
+
+def test_field_selection_keeps_id():
+    limit, after, fields = parse_query('limit=5&fields=title,eqis_score')
+    page = build_page(make_snapshot([10, 20]), limit, after, fields)
+    assert all(set(event) == {'id', 'title', 'eqis_score'} for event in page['events'])
+
+def test_query_validation():
+    assert parse_query('')[0] == 20
+    for query in ('limit=0', 'limit=101', 'limit=abc', 'fields=title,secret'):
+        with pytest.raises(BadRequest):
+            parse_query(query)
+
+def test_etag_varies_with_snapshot_and_query():
+    snapshot = make_snapshot([90, 80])
+    etag = response_etag(snapshot, 20, None, None)
+    assert etag == response_etag(make_snapshot([90, 80]), 20, None, None)
+    assert etag != response_etag(snapshot, 10, None, None)
+    assert etag != response_etag(snapshot, 20, (-80.0, 2), None)
+    assert etag != response_etag(make_snapshot([90, 80], mtime=1700000060.0), 20, None, None)
+
+def test_conditional_request_matches_etag(monkeypatch):
+    snapshot = make_snapshot([90, 80])
+    monkeypatch.delenv('HTTP_IF_MODIFIED_SINCE', raising=False)
+    monkeypatch.setenv('HTTP_IF_NONE_MATCH', f'"other", W/{snapshot["etag"]}')
+    assert page_cache.not_modified(snapshot)
+    monkeypatch.setenv('HTTP_IF_NONE_MATCH', page_cache.gzip_etag(snapshot['etag']))
+    assert page_cache.not_modified(snapshot)
+    monkeypatch.setenv('HTTP_IF_NONE_MATCH', '"other"')
+    assert not page_cache.not_modified(snapshot)
+
+def test_refresh_lock_is_per_pod():
+    # Snapshot files are local to each pod, so pods must not share a refresh lock
+    key = page_cache.refresh_lock_key('events.html', 'publisher-0')
+    assert key == page_cache.refresh_lock_key('events.html', 'publisher-0')
+    assert key != page_cache.refresh_lock_key('events.html', 'publisher-1')
+    assert key != page_cache.refresh_lock_key('events.json', 'publisher-0')
+    assert all(-(1 << 31) <= part < 1 << 31 for part in key)
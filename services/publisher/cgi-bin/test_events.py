@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Checks for the events view's time blocking (no database needed)
+Run with: python -m pytest test_events.py
+"""
+import random
+from datetime import datetime, timedelta, timezone
+from events import TemporalBlocks, temporal_cluster_articles, article_epoch
+
+START = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+def make_articles(count, span_hours=96, seed=7):
+    """Rows shaped like the events query: (id, url, title, outlet, published_at, text)"""
+    rng = random.Random(seed)
+    articles = []
+    for i in range(count):
+        published = START + timedelta(minutes=rng.randrange(span_hours * 60))
+        if i % 5 == 0:
+            published = published.replace(tzinfo=None)  # naive timestamps count as UTC
+        articles.append((i, f"https://example.com/{i}", f"Title {i}", "example.com", published, "text"))
+    return articles
+
+def test_candidates_match_pairwise_window():
+    articles = make_articles(200)
+    blocks = TemporalBlocks(articles, window_hours=24)
+    for i in range(len(articles)):
+        expected = [j for j in range(len(articles))
+                    if abs(article_epoch(articles[i]) - article_epoch(articles[j])) <= 24 * 3600]
+        assert blocks.candidates(i) == expected
+
+def test_candidates_include_the_article_and_window_edges():
+    articles = [
+        (0, "u0", "t", "o", START, "x"),
+        (1, "u1", "t", "o", START + timedelta(hours=24), "x"),
+        (2, "u2", "t", "o", START + timedelta(hours=24, seconds=1), "x"),
+    ]
+    blocks = TemporalBlocks(articles, window_hours=24)
+    assert blocks.candidates(0) == [0, 1]
+    assert blocks.candidates(1) == [0, 1, 2]
+    assert blocks.candidates(2) == [1, 2]
+
+def test_temporal_clusters_join_earliest_head_within_window():
+    articles = make_articles(150)
+    window = 12 * 3600
+
+    # Reference: scan clusters in creation order for the first head within the window
+    expected = []
+    for article in sorted(articles, key=article_epoch):
+        for cluster in expected:
+            if article_epoch(article) - article_epoch(cluster[0]) <= window:
+                cluster.append(article)
+                break
+        else:
+            expected.append([article])
+
+    clusters = temporal_cluster_articles(articles, window_hours=12)
+    assert [[article[0] for article in cluster] for cluster in clusters] == \
+           [[article[0] for article in cluster] for cluster in expected]
@@ -0,0 +1,27 @@
+#!/bin/sh
+# Start the persistent publisher worker pool, then lighttpd in the foreground.
+# lighttpd proxies the /cgi-bin/*.py script routes to gunicorn on 127.0.0.1:8000.
+set -e
+
+gunicorn \
+    --chdir /var/www \
+    --preload \
+    --workers "${PUBLISHER_WORKERS:-2}" \
+    --bind 127.0.0.1:8000 \
+    --timeout "${PUBLISHER_TIMEOUT:-60}" \
+    --max-requests "${PUBLISHER_MAX_REQUESTS:-1000}" \
+    --max-requests-jitter 100 \
+    wsgi:application &
+
+# Regenerate the materialized events page in the background so page views
+# only ever read the snapshot (see cgi-bin/page_cache.py), and fold the row
+# count deltas written by the article/event triggers into engine_stats
+(
+    while true; do
+        python3 /var/www/cgi-bin/events.py --refresh-snapshot || true
+        python3 /var/www/cgi-bin/stats.py --compact || true
+        sleep "${PAGE_REFRESH_INTERVAL:-60}"
+    done
+) &
+
+exec lighttpd -D -f /etc/lighttpd/lighttpd.conf
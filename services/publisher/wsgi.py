@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Persistent WSGI server for the publisher CGI scripts
+Hosts the cgi-bin scripts in long-lived worker processes so imports (nltk,
+sklearn, numpy, psycopg2), pooled database connections and in-memory caches
+survive between requests. lighttpd proxies the script routes here.
+
+Run with: gunicorn --preload --workers 4 --bind 127.0.0.1:8000 wsgi:application
+"""
+import io
+import os
+import sys
+import queue
+import importlib
+import threading
+import traceback
+import contextlib
+
+CGI_DIR = os.environ.get('PUBLISHER_CGI_DIR',
+                         os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cgi-bin'))
+sys.path.insert(0, CGI_DIR)
+
+import db
+
+db.enable_pooling()
+
+# Routes preserved from the CGI layout
+ROUTES = {
+    '/cgi-bin/index.py': 'index',
+    '/cgi-bin/events.py': 'events',
+    '/cgi-bin/events_optimized.py': 'events_optimized',
+    '/cgi-bin/events_debug.py': 'events_debug',
+    '/cgi-bin/health.py': 'health',
+    '/cgi-bin/api_events.py': 'api_events',
+}
+
+# Scripts that flush partial pages; their output is relayed chunk by chunk
+STREAMING = {'/cgi-bin/events.py', '/cgi-bin/events_optimized.py'}
+
+# Import every script up front; with --preload the workers share them copy-on-write
+MODULES = {path: importlib.import_module(name) for path, name in ROUTES.items()}
+
+# Scripts write to sys.stdout and read os.environ, both process-global
+_request_lock = threading.Lock()
+
+def cgi_environment(environ):
+    """CGI/1.1 meta-variables for a WSGI request"""
+    env = {
+        'GATEWAY_INTERFACE': 'CGI/1.1',
+        'SCRIPT_NAME': environ.get('PATH_INFO', ''),
+        'PATH_INFO': '',
+        'QUERY_STRING': environ.get('QUERY_STRING', ''),
+        'REQUEST_METHOD': environ.get('REQUEST_METHOD', 'GET'),
+        'SERVER_PROTOCOL': environ.get('SERVER_PROTOCOL', 'HTTP/1.1'),
+        'SERVER_NAME': environ.get('SERVER_NAME', ''),
+        'SERVER_PORT': str(environ.get('SERVER_PORT', '')),
+        'REMOTE_ADDR': environ.get('REMOTE_ADDR', ''),
+        'CONTENT_TYPE': environ.get('CONTENT_TYPE', ''),
+        'CONTENT_LENGTH': environ.get('CONTENT_LENGTH', ''),
+    }
+    for key, value in environ.items():
+        if key.startswith('HTTP_'):
+            env[key] = value
+    return env
+
+class ChunkWriter(io.RawIOBase):
+    """Raw stream that hands every flushed write to a queue"""
+
+    def __init__(self):
+        self.chunks = queue.Queue()
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.chunks.put(bytes(data))
+        return len(data)
+
+@contextlib.contextmanager
+def cgi_request(environ, output=None):
+    """Temporarily install CGI environment variables, stdin and a captured stdout"""
+    env = cgi_environment(environ)
+    saved = {key: os.environ.get(key) for key in env}
+    os.environ.update(env)
+
+    try:
+        length = int(environ.get('CONTENT_LENGTH') or 0)
+    except ValueError:
+        length = 0
+    body = environ['wsgi.input'].read(length) if length > 0 else b''
+    stdin = io.TextIOWrapper(io.BytesIO(body), encoding='utf-8')
+
+    if output is None:
+        output = io.BytesIO()
+        stdout = io.TextIOWrapper(output, encoding='utf-8', write_through=True)
+    else:
+        stdout = io.TextIOWrapper(io.BufferedWriter(output), encoding='utf-8')
+    saved_stdin = sys.stdin
+    sys.stdin = stdin
+    try:
+        with contextlib.redirect_stdout(stdout):
+            yield output
+    finally:
+        # Detach so closing the wrappers never closes the captured buffers
+        stdout.flush()
+        stdout.detach()
+        stdin.detach()
+        sys.stdin = saved_stdin
+        for key, value in saved.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+def split_cgi_output(output):
+    """Split raw output at the end of the CGI headers; None if not complete yet"""
+    positions = [(output.find(sep), sep) for sep in (b'\r\n\r\n', b'\n\n')]
+    positions = [(pos, sep) for pos, sep in positions if pos >= 0]
+    if not positions:
+        return None
+    pos, sep = min(positions)
+    return output[:pos], output[pos + len(sep):]
+
+def parse_cgi_headers(head):
+    """WSGI status and header list from a CGI header block"""
+    status = None
+    headers = []
+    for line in head.decode('latin-1').splitlines():
+        name, _, value = line.partition(':')
+        if name.strip().lower() == 'status':
+            status = value.strip()
+        elif name.strip():
+            headers.append((name.strip(), value.strip()))
+
+    if status is None:
+        has_location = any(name.lower() == 'location' for name, _ in headers)
+        status = '302 Found' if has_location else '200 OK'
+    return status, headers
+
+def parse_cgi_output(output):
+    """Split CGI script output into WSGI status, headers and body"""
+    parts = split_cgi_output(output)
+    if parts is None:
+        return '200 OK', [('Content-Type', 'text/html')], output
+
+    head, body = parts
+    status, headers = parse_cgi_headers(head)
+    if not any(name.lower() == 'content-length' for name, _ in headers):
+        headers.append(('Content-Length', str(len(body))))
+    return status, headers, body
+
+def run_script(module, environ):
+    """Run a CGI script's main() in-process and return its raw output"""
+    with _request_lock, cgi_request(environ) as output:
+        try:
+            module.main()
+        except SystemExit:
+            pass
+    return output.getvalue()
+
+def stream_script(module, environ, start_response):
+    """Run a script in a helper thread and relay its flushed output as it arrives
+
+    Without a Content-Length the server sends the body with chunked transfer
+    encoding, so the page head reaches the client before the script finishes.
+    """
+    writer = ChunkWriter()
+    done = object()
+
+    def run():
+        try:
+            with cgi_request(environ, writer):
+                module.main()
+        except SystemExit:
+            pass
+        except Exception:
+            print(f"Unhandled error streaming {environ.get('PATH_INFO')}: {traceback.format_exc()}", file=sys.stderr)
+        finally:
+            writer.chunks.put(done)
+            _request_lock.release()
+
+    _request_lock.acquire()
+    threading.Thread(target=run, daemon=True).start()
+
+    # Hold the response until the CGI header block is complete
+    pending = b''
+    while True:
+        chunk = writer.chunks.get()
+        if chunk is done:
+            status, headers, body = parse_cgi_output(pending)
+            start_response(status, headers)
+            return [body]
+        pending += chunk
+        parts = split_cgi_output(pending)
+        if parts is not None:
+            break
+
+    head, body = parts
+    status, headers = parse_cgi_headers(head)
+    start_response(status, headers)
+
+    def relay():
+        if body:
+            yield body
+        while True:
+            chunk = writer.chunks.get()
+            if chunk is done:
+                return
+            yield chunk
+
+    return relay()
+
+def application(environ, start_response):
+    path = environ.get('PATH_INFO', '') or '/'
+    module = MODULES.get(path)
+    if module is None:
+        start_response('404 Not Found', [('Content-Type', 'text/plain')])
+        return [b'Not Found\n']
+
+    if path in STREAMING:
+        return stream_script(module, environ, start_response)
+
+    try:
+        status, headers, body = parse_cgi_output(run_script(module, environ))
+    except Exception:
+        print(f"Unhandled error serving {path}: {traceback.format_exc()}", file=sys.stderr)
+        start_response('500 Internal Server Error', [('Content-Type', 'text/plain')])
+        return [b'Internal Server Error\n']
+
+    start_response(status, headers)
+    return [body]
+
+if __name__ == '__main__':
+    # Local development server
+    from wsgiref.simple_server import make_server
+    port = int(os.environ.get('PUBLISHER_PORT', '8000'))
+    print(f"Serving publisher scripts on http://127.0.0.1:{port}/", file=sys.stderr)
+    make_server('127.0.0.1', port, application).serve_forever()
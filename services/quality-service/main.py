@@ -143,6 +143,29 @@ class QualityService:
         
         return min(score, 100)  # Cap at 100
 
+    def extract_summary(self, text: str) -> Optional[str]:
+        """Short extractive summary (first two substantial sentences) stored for the publisher"""
+        if not text:
+            return None
+        
+        sentences = []
+        for sentence in text.split('.'):
+            sentence = sentence.strip()
+            if sentence and len(sentence) > 30:
+                if not sentence[0].isupper():
+                    sentence = sentence[0].upper() + sentence[1:] if len(sentence) > 1 else sentence.upper()
+                sentences.append(sentence)
+                if len(sentences) >= 2:
+                    break
+        
+        if not sentences:
+            return None
+        
+        summary = '. '.join(sentences) + '.'
+        if len(summary) > 400:
+            summary = summary[:397] + '...'
+        return summary
+
     def extract_key_entities(self, text: str) -> Set[str]:
         """Extract key entities from article text - matches publisher service algorithm"""
         if not text or len(text) < 50:
@@ -439,9 +462,11 @@ class QualityService:
             # Calculate quality scores and extract NER data
             article_scores = {}
             article_ner_data = {}
+            article_summaries = {}
             for article in articles:
                 score = self.calculate_article_quality_score(dict(article))
                 article_scores[article['id']] = score
+                article_summaries[article['id']] = self.extract_summary(article.get('text', ''))
                 
                 # Extract NER entities
                 ner_entities = self.extract_ner_entities(article.get('text', ''))
@@ -465,7 +490,8 @@ class QualityService:
                         ner_locations = %s,
                         ner_dates = %s,
                         ner_others = %s,
-                        ner_extracted_at = NOW()
+                        ner_extracted_at = NOW(),
+                        summary = %s
                     WHERE id = %s
                 """, (
                     quality_score, 
@@ -474,6 +500,7 @@ class QualityService:
                     json.dumps(ner_data.get('locations', [])),
                     json.dumps(ner_data.get('dates', [])),
                     json.dumps(ner_data.get('others', [])),
+                    article_summaries.get(article_id),
                     article_id
                 ))
                 processed_count += 1